@@ -0,0 +1,64 @@
+"""
+In-process cache for wallet list responses.
+
+Disabled unless WALLET_LIST_CACHE_TTL is set. Writes only invalidate the
+cache of the process that handled them, so enable it only when the API runs
+as a single worker.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from src.config.settings import Settings
+
+# Upper bound on cached pages across all users; least recently used go first
+MAX_WALLET_LIST_ENTRIES = 1024
+
+# (user_id, skip, limit) -> (expires_at, result), least recently used first
+_wallet_lists: "OrderedDict[Tuple[str, int, int], Tuple[float, Dict[str, Any]]]" = (
+    OrderedDict()
+)
+
+
+def get_wallet_list(user_id, skip: int, limit: int) -> Optional[Dict[str, Any]]:
+    """Return the cached list_wallets result, or None on a miss or expiry."""
+    key = (str(user_id), skip, limit)
+    entry = _wallet_lists.get(key)
+    if entry is None:
+        return None
+    expires_at, result = entry
+    if expires_at <= time.monotonic():
+        del _wallet_lists[key]
+        return None
+    _wallet_lists.move_to_end(key)
+    return result
+
+
+def set_wallet_list(user_id, skip: int, limit: int, result: Dict[str, Any]) -> None:
+    """Cache a list_wallets result for Settings.WALLET_LIST_CACHE_TTL seconds."""
+    ttl = Settings.WALLET_LIST_CACHE_TTL
+    if ttl <= 0:
+        return
+    now = time.monotonic()
+    # Sweep expired pages so entries nobody reads again don't linger
+    for key in [k for k, (expires_at, _) in _wallet_lists.items() if expires_at <= now]:
+        del _wallet_lists[key]
+
+    key = (str(user_id), skip, limit)
+    _wallet_lists[key] = (now + ttl, result)
+    _wallet_lists.move_to_end(key)
+    while len(_wallet_lists) > MAX_WALLET_LIST_ENTRIES:
+        _wallet_lists.popitem(last=False)
+
+
+def invalidate_wallet_lists(user_id) -> None:
+    """Drop every cached wallet page for a user after a wallet write."""
+    owner = str(user_id)
+    for key in [k for k in _wallet_lists if k[0] == owner]:
+        del _wallet_lists[key]
+
+
+def clear_wallet_lists() -> None:
+    """Drop all cached wallet lists."""
+    _wallet_lists.clear()
@@ -6,6 +6,7 @@ from typing import Annotated, Optional
 from bson import ObjectId
 from pymongo.database import Database
 
+from api.cache import get_wallet_list, invalidate_wallet_lists, set_wallet_list
 from src.config.mongodb import get_db
 from src.models.mongodb_models import Wallet
 from src.auth.firebase_auth import get_current_user_from_token
@@ -58,20 +59,31 @@ async def list_wallets(
     **Errors:**
     - 401: Invalid or missing Firebase token
     """
-    # Query for wallets - support both ObjectId and string formats for backwards compatibility
+    cached = get_wallet_list(user_id, skip, limit)
+    if cached is not None:
+        return cached
+
+    # Query for wallets; the server converts ObjectIds to strings for JSON
+    # serialization so the documents can be returned as-is
     wallets = list(
-        db.wallets.find({"$or": [{"user_id": user_id}, {"user_id": str(user_id)}]})
-        .skip(skip)
-        .limit(limit)
+        db.wallets.aggregate(
+            [
+                {"$match": {"user_id": user_id}},
+                {"$skip": skip},
+                {"$limit": limit},
+                {
+                    "$addFields": {
+                        "_id": {"$toString": "$_id"},
+                        "user_id": {"$toString": "$user_id"},
+                    }
+                },
+            ]
+        )
     )
 
-    # Convert ObjectId to string for JSON serialization
-    for wallet in wallets:
-        wallet["_id"] = str(wallet["_id"])
-        if isinstance(wallet.get("user_id"), ObjectId):
-            wallet["user_id"] = str(wallet["user_id"])
-
-    return {"wallets": wallets, "count": len(wallets)}
+    result = {"wallets": wallets, "count": len(wallets)}
+    set_wallet_list(user_id, skip, limit, result)
+    return result
 
 
 @router.post("", summary="Create a wallet", response_model=None)
@@ -98,12 +110,11 @@ async def create_wallet(
     - 409: Wallet with this name already exists for the user
     """
     try:
-        # Check if wallet with same name already exists for this user
+        # Check if wallet with same name already exists for this user.
+        # Also match a legacy string owner until migrate_wallet_user_ids.py
+        # has run; both values are seeks on the (user_id, name) index.
         existing_wallet = db.wallets.find_one(
-            {
-                "$or": [{"user_id": user_id}, {"user_id": str(user_id)}],
-                "name": wallet_data.name,
-            }
+            {"user_id": {"$in": [user_id, str(user_id)]}, "name": wallet_data.name}
         )
         if existing_wallet:
             raise HTTPException(
@@ -120,7 +131,10 @@ async def create_wallet(
 
         # Insert wallet into MongoDB (use mode='python' to keep ObjectId type)
         wallet_dict = wallet.model_dump(by_alias=True, exclude={"id"}, mode="python")
+        # PyObjectId serializes to str; store the owner as ObjectId
+        wallet_dict["user_id"] = wallet.user_id
         result = db.wallets.insert_one(wallet_dict)
+        invalidate_wallet_lists(user_id)
 
         # Get the created wallet
         created_wallet = db.wallets.find_one({"_id": result.inserted_id})
@@ -171,26 +185,21 @@ async def delete_wallet(
             raise HTTPException(status_code=400, detail="Invalid wallet ID format")
 
         # Find wallet (must belong to the user)
-        wallet = db.wallets.find_one(
-            {
-                "_id": wallet_obj_id,
-                "$or": [{"user_id": user_id}, {"user_id": str(user_id)}],
-            }
-        )
+        wallet = db.wallets.find_one({"_id": wallet_obj_id, "user_id": user_id})
         if not wallet:
             raise HTTPException(
                 status_code=404, detail="Wallet not found or not owned by user"
             )
 
-        # Count and delete transactions associated with this wallet
-        transaction_count = db.transactions.count_documents(
+        # Delete transactions associated with this wallet; the result carries
+        # the count, so no separate count_documents round trip is needed
+        transaction_count = db.transactions.delete_many(
             {"wallet_id": wallet_obj_id}
-        )
-        if transaction_count > 0:
-            db.transactions.delete_many({"wallet_id": wallet_obj_id})
+        ).deleted_count
 
         # Delete the wallet
         db.wallets.delete_one({"_id": wallet_obj_id})
+        invalidate_wallet_lists(user_id)
 
         return {
             "status": "success",
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+One-off migration: store legacy string wallet owners as ObjectId.
+
+Run once per database after deploying the ObjectId owner change:
+
+    python migrate_wallet_user_ids.py            # convert
+    python migrate_wallet_user_ids.py --dry-run  # only count legacy wallets
+
+Wallets whose converted (user_id, name) would collide with an existing
+wallet are renamed to "<name> (<wallet id>)"; each rename is printed.
+"""
+
+import argparse
+
+from src.config.mongodb import MongoDBConfig
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only report how many wallets still have a string user_id",
+    )
+    args = parser.parse_args()
+
+    db = MongoDBConfig.get_database()
+    legacy_count = db.wallets.count_documents({"user_id": {"$type": "string"}})
+    print(f"Wallets with a string user_id: {legacy_count}")
+
+    if args.dry_run or legacy_count == 0:
+        return
+
+    converted = MongoDBConfig.normalize_wallet_user_ids(db)
+    print(f"Converted {converted} wallets")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,10 @@
 
 import os
 from typing import Optional
+from bson import ObjectId
 from pymongo import MongoClient
 from pymongo.database import Database
+from pymongo.errors import DuplicateKeyError
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -279,15 +281,28 @@ class MongoDBConfig:
 
         # Create indexes for transactions
         print("[DEBUG] Creating indexes for transactions collection...")
+        cls.create_transaction_indexes(db)
+        print("[DEBUG] Transactions indexes created")
+
+        # Create indexes for column_mapping_cache
+        print("[DEBUG] Creating indexes for column_mapping_cache collection...")
+        cls.create_column_mapping_cache_indexes(db)
+        print("[DEBUG] Column_mapping_cache indexes created")
+
+        print("[DEBUG] All indexes created successfully!")
+
+    @classmethod
+    def create_transaction_indexes(cls, db: Database) -> None:
+        """Create the transactions indexes (idempotent)."""
         db.transactions.create_index("wallet_id")
         db.transactions.create_index("asset_id")
         db.transactions.create_index("date")
         db.transactions.create_index("transaction_type")
         db.transactions.create_index([("wallet_id", 1), ("date", -1)])
-        print("[DEBUG] Transactions indexes created")
 
-        # Create indexes for column_mapping_cache
-        print("[DEBUG] Creating indexes for column_mapping_cache collection...")
+    @classmethod
+    def create_column_mapping_cache_indexes(cls, db: Database) -> None:
+        """Create the column_mapping_cache indexes (idempotent)."""
         db.column_mapping_cache.create_index(
             [("user_id", 1), ("cache_key", 1), ("version", 1)],
             unique=True,
@@ -295,9 +310,48 @@ class MongoDBConfig:
         )
         db.column_mapping_cache.create_index("last_used_at")
         db.column_mapping_cache.create_index("hit_count")
-        print("[DEBUG] Column_mapping_cache indexes created")
 
-        print("[DEBUG] All indexes created successfully!")
+    @classmethod
+    def normalize_wallet_user_ids(cls, db: Database) -> int:
+        """
+        Convert legacy string wallet user_ids to ObjectId.
+
+        A one-off data migration, run by migrate_wallet_user_ids.py rather
+        than at startup. Older wallets stored user_id as a string, which forced ownership
+        queries to match both formats. A legacy wallet whose converted
+        (user_id, name) would collide with an existing wallet is renamed to
+        "<name> (<wallet id>)" so no wallet is left with a string owner.
+
+        Returns:
+            Number of wallets converted
+        """
+        converted = 0
+        legacy_wallets = db.wallets.find(
+            {"user_id": {"$type": "string"}}, {"user_id": 1, "name": 1}
+        )
+        for wallet in legacy_wallets:
+            if not ObjectId.is_valid(wallet["user_id"]):
+                continue
+            user_id = ObjectId(wallet["user_id"])
+            update = {"user_id": user_id}
+            if db.wallets.find_one(
+                {"user_id": user_id, "name": wallet["name"]}, {"_id": 1}
+            ):
+                update["name"] = f"{wallet['name']} ({wallet['_id']})"
+                print(
+                    f"[WARNING] Wallet {wallet['_id']} renamed to "
+                    f"'{update['name']}': duplicate name"
+                )
+            try:
+                db.wallets.update_one({"_id": wallet["_id"]}, {"$set": update})
+                converted += 1
+            except DuplicateKeyError:
+                print(
+                    f"[WARNING] Wallet {wallet['_id']} not normalized: duplicate name"
+                )
+        if converted:
+            print(f"[DEBUG] Normalized user_id on {converted} wallets")
+        return converted
 
 
 # Convenience functions
@@ -30,6 +30,18 @@ def _load_env_once():
         load_dotenv(env_file, override=False)  # Don't override existing env vars
 
 
+def _float_env(name: str, default: float) -> float:
+    """Read a float environment variable, falling back to default if malformed."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        print(f"[WARNING] Ignoring invalid {name}={value!r}; using {default}")
+        return default
+
+
 # Load environment on module import
 _load_env_once()
 
@@ -61,13 +73,17 @@ class Settings:
         # Split by comma and strip whitespace
         return [origin.strip() for origin in cors_origins.split(",") if origin.strip()]
 
+    # Seconds a user's wallet list stays cached in-process. Off by default:
+    # invalidation is per process, so only enable it for a single worker
+    WALLET_LIST_CACHE_TTL: float = _float_env("WALLET_LIST_CACHE_TTL", 0.0)
+
     # Table detection settings
     MAX_ROWS_TO_SCAN: int = 50
     MIN_COLUMNS_FOR_TABLE: int = 2
     HEADER_DETECTION_THRESHOLD: float = 0.7
 
     # Target columns for the TransactionRecord model
-    TARGET_COLUMNS = [
+    TARGET_COLUMNS = (
         "asset_name",
         "date",
         "asset_price",
@@ -76,7 +92,7 @@ class Settings:
         "fee",
         "currency",
         "transaction_type",
-    ]
+    )
 
     @classmethod
     def validate(cls) -> None:
@@ -1,10 +1,44 @@
 """Data models for financial records."""
 
 from datetime import datetime
-from typing import List
-from pydantic import BaseModel, Field, field_validator
+from typing import IO, List
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, field_validator
+import numpy as np
 import pandas as pd
 
+# Common date formats tried in order (including European DD.MM.YYYY)
+DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%d/%m/%Y",
+    "%m/%d/%Y",
+    "%Y/%m/%d",
+    "%d-%m-%Y",
+    "%d.%m.%Y",
+    "%Y.%m.%d",
+)
+
+
+def _parse_date_column(dates: pd.Series) -> pd.Series:
+    """
+    Parse string dates column-wise using DATE_FORMATS in order.
+
+    Values no format matches are left untouched so record validation
+    reports them as before.
+    """
+    values = dates.to_numpy(dtype=object, copy=True)
+    pending = np.fromiter((isinstance(v, str) for v in values), bool, len(values))
+    for fmt in DATE_FORMATS:
+        if not pending.any():
+            break
+        converted = pd.to_datetime(
+            pd.Series(values[pending]), format=fmt, errors="coerce", cache=True
+        )
+        hit = converted.notna().to_numpy()
+        targets = np.flatnonzero(pending)[hit]
+        values[targets] = converted[hit].to_numpy(dtype=object)
+        pending[targets] = False
+    return pd.Series(values, index=dates.index, name=dates.name)
+
 
 class TransactionRecord(BaseModel):
     """Individual transaction record with validation."""
@@ -41,16 +75,7 @@ class TransactionRecord(BaseModel):
         if isinstance(v, datetime):
             return v
         if isinstance(v, str):
-            # Try common date formats (including European DD.MM.YYYY)
-            for fmt in [
-                "%Y-%m-%d",
-                "%d/%m/%Y",
-                "%m/%d/%Y",
-                "%Y/%m/%d",
-                "%d-%m-%Y",
-                "%d.%m.%Y",
-                "%Y.%m.%d",
-            ]:
+            for fmt in DATE_FORMATS:
                 try:
                     return datetime.strptime(v, fmt)
                 except ValueError:
@@ -67,36 +92,55 @@ class TransactionRecord(BaseModel):
         raise ValueError(f"Invalid date value: {v}")
 
 
+_RECORDS_ADAPTER = TypeAdapter(List[TransactionRecord])
+
+
+def _validate_each(
+    rows: List[dict], positions: List[int], index: pd.Index, errors: List[str]
+) -> dict:
+    """Validate rows one at a time, appending 'Row N: ...' for each failure."""
+    validated = {}
+    for pos in positions:
+        try:
+            validated[pos] = TransactionRecord(**rows[pos])
+        except Exception as e:
+            errors.append(f"Row {index[pos]}: {str(e)}")
+    return validated
+
+
 class FinancialDataModel:
     """Data model handler for transaction records using pandas."""
 
+    # Required columns, shared by all instances
+    columns = (
+        "asset_name",
+        "date",
+        "asset_price",
+        "volume",
+        "transaction_amount",
+        "fee",
+        "currency",
+    )
+
     def __init__(self):
         """Initialize empty DataFrame with required columns."""
-        self.columns = [
-            "asset_name",
-            "date",
-            "asset_price",
-            "volume",
-            "transaction_amount",
-            "fee",
-            "currency",
-        ]
         self.df: pd.DataFrame = pd.DataFrame(columns=self.columns)
 
     def add_record(self, record: TransactionRecord) -> None:
         """Add a single validated record to the DataFrame."""
-        record_dict = record.model_dump()
-        new_row = pd.DataFrame([record_dict])
-        self.df = pd.concat([self.df, new_row], ignore_index=True)
+        self.add_records([record])
 
     def add_records(self, records: List[TransactionRecord]) -> None:
         """Add multiple validated records to the DataFrame."""
         if not records:
             return
 
-        records_data = [record.model_dump() for record in records]
-        new_df = pd.DataFrame(records_data)
-        self.df = pd.concat([self.df, new_df], ignore_index=True)
+        new_df = pd.DataFrame.from_records([record.model_dump() for record in records])
+        if self.df.empty:
+            # Nothing to append to; skip concat and its copy of the new rows
+            self.df = new_df
+        else:
+            self.df = pd.concat([self.df, new_df], ignore_index=True)
 
     def load_from_dataframe(self, df: pd.DataFrame) -> List[str]:
         """
@@ -106,14 +150,30 @@ class FinancialDataModel:
             List of error messages for invalid records.
         """
         errors = []
-        valid_records = []
-
-        for idx, row in df.iterrows():
+        if "date" in df.columns and not pd.api.types.is_datetime64_any_dtype(
+            df["date"]
+        ):
+            df = df.assign(date=_parse_date_column(df["date"]))
+        rows = df.to_dict(orient="records")
+
+        try:
+            valid_records = _RECORDS_ADAPTER.validate_python(rows)
+        except Exception as exc:
+            # Re-validate the failing rows one by one to keep per-row error
+            # messages. Only a ValidationError says which rows failed; anything
+            # else (e.g. a TypeError from a validator) means checking them all.
+            failed = set(range(len(rows)))
+            if isinstance(exc, ValidationError):
+                failed = {err["loc"][0] for err in exc.errors() if err["loc"]} or failed
+            validated = _validate_each(rows, sorted(failed), df.index, errors)
+
+            rest = [pos for pos in range(len(rows)) if pos not in failed]
             try:
-                record = TransactionRecord(**row.to_dict())
-                valid_records.append(record)
-            except Exception as e:
-                errors.append(f"Row {idx}: {str(e)}")
+                batch = _RECORDS_ADAPTER.validate_python([rows[pos] for pos in rest])
+                validated.update(zip(rest, batch))
+            except Exception:
+                validated.update(_validate_each(rows, rest, df.index, errors))
+            valid_records = [validated[pos] for pos in sorted(validated)]
 
         if valid_records:
             self.add_records(valid_records)
@@ -124,8 +184,8 @@ class FinancialDataModel:
         """Return the underlying DataFrame."""
         return self.df.copy()
 
-    def to_csv(self, filepath: str) -> None:
-        """Export data to CSV."""
+    def to_csv(self, filepath: str | IO[str]) -> None:
+        """Export data to CSV (a path or a text buffer)."""
         self.df.to_csv(filepath, index=False)
 
     def to_excel(self, filepath: str) -> None:
@@ -1,12 +1,20 @@
 """Asset type mapper service using Google GenAI."""
 
+from functools import lru_cache
 from typing import Dict, Optional
-import json
+import re
 import google.generativeai as genai
+import orjson
 
 from ..config.settings import Settings
 from ..models.mongodb_models import AssetType
 
+# Flat JSON object carrying an asset_type key; no nested braces, so the
+# match is linear in the response length.
+_JSON_RE = re.compile(r'\{[^{}]*"asset_type"[^{}]*\}')
+
+_VALID_ASSET_TYPES = frozenset(asset_type.value for asset_type in AssetType)
+
 
 class AssetTypeMapper:
     """Maps asset names to asset types and symbols using Google GenAI."""
@@ -30,6 +38,9 @@ class AssetTypeMapper:
         genai.configure(api_key=self.api_key)
         self.model = genai.GenerativeModel(self.model_name)
 
+        # Successful inferences keyed on the normalized asset name
+        self._inference_cache: Dict[str, Dict[str, str]] = {}
+
     def infer_asset_info(self, asset_name: str) -> Optional[Dict[str, str]]:
         """
         Infer asset type and symbol from asset name using Google GenAI.
@@ -44,6 +55,10 @@ class AssetTypeMapper:
         if not asset_name or not asset_name.strip():
             return None
 
+        cache_key = asset_name.strip().lower()
+        if cache_key in self._inference_cache:
+            return dict(self._inference_cache[cache_key])
+
         try:
             prompt = self._build_asset_classification_prompt(asset_name.strip())
             response = self.model.generate_content(prompt)
@@ -51,6 +66,7 @@ class AssetTypeMapper:
 
             # Validate the result
             if self._validate_asset_result(result):
+                self._inference_cache[cache_key] = dict(result)
                 return result
             else:
                 return None
@@ -60,8 +76,10 @@ class AssetTypeMapper:
             print(f"Warning: Asset type inference failed for '{asset_name}': {str(e)}")
             return None
 
-    def _build_asset_classification_prompt(self, asset_name: str) -> str:
-        """Build prompt for asset classification."""
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _build_asset_classification_prompt(asset_name: str) -> str:
+        """Build prompt for asset classification (memoized per asset name)."""
 
         valid_asset_types = [asset_type.value for asset_type in AssetType]
 
@@ -88,20 +106,13 @@ IMPORTANT: Return ONLY the JSON object, no additional text or explanation."""
         if not response_text or not response_text.strip():
             return None
 
-        # Clean the response text
-        cleaned_text = response_text.strip()
-
         # Try to find JSON in the response
-        start_idx = cleaned_text.find("{")
-        end_idx = cleaned_text.rfind("}") + 1
-
-        if start_idx == -1 or end_idx == 0:
+        match = _JSON_RE.search(response_text)
+        if not match:
             return None
 
-        json_text = cleaned_text[start_idx:end_idx]
-
         try:
-            result = json.loads(json_text)
+            result = orjson.loads(match.group(0))
 
             # Ensure we have the expected structure
             if isinstance(result, dict) and "asset_type" in result:
@@ -112,7 +123,7 @@ IMPORTANT: Return ONLY the JSON object, no additional text or explanation."""
             else:
                 return None
 
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             return None
 
     def _validate_asset_result(self, result: Optional[Dict[str, str]]) -> bool:
@@ -123,8 +134,7 @@ IMPORTANT: Return ONLY the JSON object, no additional text or explanation."""
         asset_type = result.get("asset_type", "").strip().lower()
 
         # Check if asset_type is valid
-        valid_types = [asset_type.value for asset_type in AssetType]
-        if asset_type not in valid_types:
+        if asset_type not in _VALID_ASSET_TYPES:
             return False
 
         # Symbol is optional, but if present should be reasonable
@@ -133,3 +143,7 @@ IMPORTANT: Return ONLY the JSON object, no additional text or explanation."""
             return False
 
         return True
+
+    def clear_cache(self):
+        """Clear cached asset inferences."""
+        self._inference_cache.clear()
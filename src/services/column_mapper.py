@@ -1,19 +1,73 @@
 """Column mapper service using Google GenAI."""
 
-from typing import Dict, List, Optional
-import json
+from typing import Dict, List, Optional, Sequence
 import hashlib
+import json
+import re
 from datetime import datetime, date, UTC
 import google.generativeai as genai
 import pandas as pd
 import numpy as np
 
+try:
+    from orjson import loads as _loads_json
+except ImportError:  # orjson only speeds up parsing; the stdlib parser works too
+    from json import loads as _loads_json
+
 from ..config.settings import Settings
 
+# Body of the first markdown code block, with or without a json tag; an
+# unterminated block runs to the end of the text
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*(?:```|$)", re.DOTALL | re.IGNORECASE)
+
 
 class ColumnMapper:
     """Maps source columns to target schema using Google GenAI."""
 
+    # Static prompt sections, built once; only the columns and samples vary
+    _PROMPT_INTRO = """You are a data mapping expert. Your task is to map source \
+columns to target columns based on their meaning and content.
+
+TARGET SCHEMA (required columns):"""
+
+    _PROMPT_COLUMN_DESCRIPTIONS = """TARGET COLUMN DESCRIPTIONS:
+- asset_name: Name of the asset (stock, crypto, etc.)
+- date: Transaction or record date
+- asset_price: Price per unit/item of the asset
+- volume: Quantity or number of assets
+- transaction_amount: Total transaction amount (can be calculated if missing)
+- fee: Transaction fee (set to 0 if not available)
+- currency: Currency code (USD, EUR, etc.)
+- transaction_type: Type of transaction (buy, sell, dividend, transfer_in, transfer_out, etc.)"""
+
+    _PROMPT_INSTRUCTIONS = """INSTRUCTIONS:
+1. Analyze the source column names and sample data
+2. Map each TARGET column to the most appropriate SOURCE column
+3. If no appropriate source column exists, set the value to null
+4. Return ONLY a valid JSON object with the mapping
+5. The JSON should map TARGET column names (keys) to SOURCE column names (values)
+
+IMPORTANT: Return ONLY the JSON object, no additional text or explanation.
+
+Example output format:
+{"asset_name": "stock_symbol",
+  "date": "transaction_date",
+  "asset_price": "price_per_share",
+  "volume": "quantity",
+  "transaction_amount": "total_amount",
+  "fee": "transaction_fee",
+  "currency": "curr",
+  "transaction_type": "transaction_type_column"
+}
+
+If a target column cannot be mapped, use null:
+{"asset_name": "stock_name",
+  "fee": null,
+  "transaction_amount": null
+}
+
+Now provide the mapping:"""
+
     def __init__(
         self,
         api_key: Optional[str] = None,
@@ -53,11 +107,21 @@ class ColumnMapper:
             file_type: File type (csv, xlsx, xls)
 
         Returns:
-            SHA256 hash as cache key
+            128-bit BLAKE2b hex digest as cache key
         """
-        columns_str = "|".join(sorted(source_df.columns.tolist()))
-        key_data = f"{file_type}:{len(source_df.columns)}:{columns_str}"
-        return hashlib.sha256(key_data.encode()).hexdigest()
+        # NUL cannot appear in a header, so unlike "|" it can't make two
+        # different column lists collide
+        columns = "\0".join(sorted(map(str, source_df.columns)))
+        key_data = f"{file_type}\0{len(source_df.columns)}\0{columns}".encode()
+        return hashlib.blake2b(key_data, digest_size=16).hexdigest()
+
+    def _cache_filter(self, cache_key: str) -> Dict[str, object]:
+        """Filter matching this user's cache entry for the current version."""
+        return {
+            "user_id": self.user_id,
+            "cache_key": cache_key,
+            "version": self.cache_version,
+        }
 
     def _get_cached_mapping(self, cache_key: str) -> Optional[Dict[str, str]]:
         """
@@ -73,23 +137,18 @@ class ColumnMapper:
             return None
 
         try:
-            cache_entry = self.db.column_mapping_cache.find_one(
+            # Look up and bump hit count/last used timestamp in one round trip;
+            # served by the user_cache_key_version_idx unique index
+            cache_entry = self.db.column_mapping_cache.find_one_and_update(
+                self._cache_filter(cache_key),
                 {
-                    "user_id": self.user_id,
-                    "cache_key": cache_key,
-                    "version": self.cache_version,
-                }
+                    "$inc": {"hit_count": 1},
+                    "$set": {"last_used_at": datetime.now(UTC)},
+                },
+                projection={"mapping": 1, "_id": 0},
             )
 
             if cache_entry:
-                # Update hit count and last used timestamp
-                self.db.column_mapping_cache.update_one(
-                    {"_id": cache_entry["_id"]},
-                    {
-                        "$inc": {"hit_count": 1},
-                        "$set": {"last_used_at": datetime.now(UTC)},
-                    },
-                )
                 return cache_entry["mapping"]
         except Exception as e:
             # Log error but don't fail - just skip cache
@@ -117,26 +176,22 @@ class ColumnMapper:
             return
 
         try:
-            cache_doc = {
-                "user_id": self.user_id,
-                "cache_key": cache_key,
-                "column_names": source_df.columns.tolist(),
-                "file_type": file_type,
-                "column_count": len(source_df.columns),
-                "mapping": mapping,
-                "version": self.cache_version,
-                "hit_count": 0,
-                "created_at": datetime.now(UTC),
-                "last_used_at": datetime.now(UTC),
-            }
+            now = datetime.now(UTC)
 
+            # Single atomic upsert; re-storing an existing entry refreshes the
+            # mapping but keeps its hit count and creation time
             self.db.column_mapping_cache.update_one(
+                self._cache_filter(cache_key),
                 {
-                    "user_id": self.user_id,
-                    "cache_key": cache_key,
-                    "version": self.cache_version,
+                    "$set": {"mapping": mapping, "last_used_at": now},
+                    "$setOnInsert": {
+                        "column_names": source_df.columns.tolist(),
+                        "file_type": file_type,
+                        "column_count": len(source_df.columns),
+                        "hit_count": 0,
+                        "created_at": now,
+                    },
                 },
-                {"$set": cache_doc},
                 upsert=True,
             )
         except Exception as e:
@@ -146,7 +201,7 @@ class ColumnMapper:
     def map_columns(
         self,
         source_df: pd.DataFrame,
-        target_columns: List[str],
+        target_columns: Sequence[str],
         sample_rows: int = 5,
         file_type: str = "csv",
     ) -> Dict[str, str]:
@@ -155,7 +210,7 @@ class ColumnMapper:
 
         Args:
             source_df: Source DataFrame with unknown column structure
-            target_columns: List of target column names to map to
+            target_columns: Target column names to map to
             sample_rows: Number of sample rows to provide as context
             file_type: File type (csv, xlsx, xls) for cache key generation
 
@@ -226,28 +281,17 @@ class ColumnMapper:
     def _build_mapping_prompt(
         self,
         source_columns: List[str],
-        target_columns: List[str],
+        target_columns: Sequence[str],
         sample_data: List[Dict],
     ) -> str:
         """Build prompt for the AI model."""
         # Ensure all sample data is JSON-serializable
         serialized_sample = self._serialize_for_json(sample_data)
 
-        prompt = f"""You are a data mapping expert. Your task is to map source \
-columns to target columns based on their meaning and content.
-
-TARGET SCHEMA (required columns):
+        return f"""{self._PROMPT_INTRO}
 {json.dumps(target_columns, indent=2)}
 
-TARGET COLUMN DESCRIPTIONS:
-- asset_name: Name of the asset (stock, crypto, etc.)
-- date: Transaction or record date
-- asset_price: Price per unit/item of the asset
-- volume: Quantity or number of assets
-- transaction_amount: Total transaction amount (can be calculated if missing)
-- fee: Transaction fee (set to 0 if not available)
-- currency: Currency code (USD, EUR, etc.)
-- transaction_type: Type of transaction (buy, sell, dividend, transfer_in, transfer_out, etc.)
+{self._PROMPT_COLUMN_DESCRIPTIONS}
 
 SOURCE COLUMNS:
 {json.dumps(source_columns, indent=2)}
@@ -255,35 +299,7 @@ SOURCE COLUMNS:
 SAMPLE DATA FROM SOURCE (first few rows):
 {json.dumps(serialized_sample, indent=2)}
 
-INSTRUCTIONS:
-1. Analyze the source column names and sample data
-2. Map each TARGET column to the most appropriate SOURCE column
-3. If no appropriate source column exists, set the value to null
-4. Return ONLY a valid JSON object with the mapping
-5. The JSON should map TARGET column names (keys) to SOURCE column names (values)
-
-IMPORTANT: Return ONLY the JSON object, no additional text or explanation.
-
-Example output format:
-{{"asset_name": "stock_symbol",
-  "date": "transaction_date",
-  "asset_price": "price_per_share",
-  "volume": "quantity",
-  "transaction_amount": "total_amount",
-  "fee": "transaction_fee",
-  "currency": "curr",
-  "transaction_type": "transaction_type_column"
-}}
-
-If a target column cannot be mapped, use null:
-{{"asset_name": "stock_name",
-  "fee": null,
-  "transaction_amount": null
-}}
-
-Now provide the mapping:"""
-
-        return prompt
+{self._PROMPT_INSTRUCTIONS}"""
 
     def _parse_mapping_response(self, response_text: str) -> Dict[str, Optional[str]]:
         """Parse AI response to extract column mapping."""
@@ -291,29 +307,23 @@ Now provide the mapping:"""
         response_text = response_text.strip()
 
         # Extract JSON from response (it might be wrapped in markdown code blocks)
-        if "```json" in response_text:
-            start = response_text.find("```json") + 7
-            end = response_text.find("```", start)
-            response_text = response_text[start:end].strip()
-        elif "```" in response_text:
-            start = response_text.find("```") + 3
-            end = response_text.find("```", start)
-            response_text = response_text[start:end].strip()
+        fenced = _FENCE_RE.search(response_text)
+        if fenced:
+            response_text = fenced.group(1)
 
         try:
-            mapping = json.loads(response_text)
+            mapping = _loads_json(response_text)
             return mapping
         except json.JSONDecodeError as e:
             raise ValueError(
-                f"Failed to parse AI response as JSON: {
-                    str(e)}\nResponse: {response_text}"
+                f"Failed to parse AI response as JSON: {str(e)}\nResponse: {response_text}"
             )
 
     def _validate_mapping(
         self,
         mapping: Dict[str, Optional[str]],
         source_columns: List[str],
-        target_columns: List[str],
+        target_columns: Sequence[str],
     ) -> None:
         """Validate that the mapping is reasonable."""
         # Check that all target columns are present in mapping
@@ -322,8 +332,9 @@ Now provide the mapping:"""
             raise ValueError(f"Mapping is missing target columns: {missing_targets}")
 
         # Check that mapped source columns actually exist
+        known_sources = set(source_columns)
         for target, source in mapping.items():
-            if source is not None and source not in source_columns:
+            if source is not None and source not in known_sources:
                 raise ValueError(
                     f"Mapping references non-existent source column '{source}' "
                     f"for target column '{target}'"
@@ -347,16 +358,18 @@ Now provide the mapping:"""
             DataFrame with target column structure
         """
         default_values = default_values or {}
-        result_data = {}
-
-        for target_col, source_col in mapping.items():
-            if source_col is not None and source_col in source_df.columns:
-                result_data[target_col] = source_df[source_col]
-            elif target_col in default_values:
-                result_data[target_col] = default_values[target_col]
-            else:
-                # Create column with None values
-                result_data[target_col] = None
-
-        result_df = pd.DataFrame(result_data)
-        return result_df
+        source_columns = set(source_df.columns)
+
+        # Build the frame in a single constructor call: mapped targets reuse the
+        # source Series, unmapped ones broadcast their default (or None)
+        result_data = {
+            target_col: (
+                source_df[source_col]
+                if source_col is not None and source_col in source_columns
+                else default_values.get(target_col)
+            )
+            for target_col, source_col in mapping.items()
+        }
+
+        # Explicit index keeps the row count when nothing maps to a source column
+        return pd.DataFrame(result_data, index=source_df.index)
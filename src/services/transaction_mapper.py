@@ -164,11 +164,12 @@ class TransactionMapper:
 
         # If collection is provided, try to find in DB
         if wallets_collection is not None:
-            # Search with both ObjectId and string user_id to handle type inconsistencies
+            # Owners are stored as ObjectId; also match legacy string owners
+            # until migrate_wallet_user_ids.py has run, so no duplicate is made
             existing = wallets_collection.find_one(
                 {
+                    "user_id": {"$in": [ObjectId(user_id), str(user_id)]},
                     "name": wallet_name,
-                    "$or": [{"user_id": user_id}, {"user_id": str(user_id)}],
                 }
             )
             if existing:
@@ -178,9 +179,12 @@ class TransactionMapper:
 
             # Create new wallet in DB
             wallet = Wallet(user_id=user_id, name=wallet_name)
-            result = wallets_collection.insert_one(
-                wallet.model_dump(by_alias=True, exclude={"id"}, mode="python")
+            wallet_dict = wallet.model_dump(
+                by_alias=True, exclude={"id"}, mode="python"
             )
+            # PyObjectId serializes to str; store the owner as ObjectId
+            wallet_dict["user_id"] = wallet.user_id
+            result = wallets_collection.insert_one(wallet_dict)
             wallet_id = PyObjectId(result.inserted_id)
             self._wallet_cache[cache_key] = wallet_id
             return wallet_id
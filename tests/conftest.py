@@ -6,9 +6,135 @@ from pathlib import Path
 import tempfile
 import uuid
 import os
+import sys
 from unittest.mock import MagicMock, patch
 import jwt
 import time
+from types import MappingProxyType
+import mongomock
+
+
+def pytest_addoption(parser):
+    """Register custom command line options."""
+    parser.addoption(
+        "--real-mongo",
+        action="store_true",
+        default=False,
+        help="Run database tests against the MongoDB at MONGODB_URL instead of mongomock",
+    )
+
+
+def pytest_configure(config):
+    """Give each pytest-xdist worker its own test database."""
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    if worker:
+        base = os.getenv("MONGODB_DATABASE", "financial_tracker")
+        os.environ["MONGODB_DATABASE"] = f"{base}_{worker}"
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests marked real_mongo unless --real-mongo is given."""
+    if config.getoption("--real-mongo"):
+        return
+
+    skip_real_mongo = pytest.mark.skip(reason="needs --real-mongo to run")
+    for item in items:
+        if "real_mongo" in item.keywords:
+            item.add_marker(skip_real_mongo)
+
+
+@pytest.fixture(scope="session")
+def mongomock_client():
+    """Shared in-memory MongoDB client used when --real-mongo is not given."""
+    client = mongomock.MongoClient()
+    yield client
+    client.close()
+
+
+@pytest.fixture(scope="session")
+def mongo_test_db(request):
+    """
+    Database handle shared by the whole session.
+
+    This is the mongomock database unless --real-mongo is given, in which case
+    it is the MongoDBConfig singleton. Session-scoped fixtures use it to seed
+    data once, before the per-test backend swap below is in place.
+    """
+    if request.config.getoption("--real-mongo"):
+        from src.config.mongodb import MongoDBConfig
+
+        return MongoDBConfig.get_database()
+
+    client = request.getfixturevalue("mongomock_client")
+    return client[os.getenv("MONGODB_DATABASE", "financial_tracker")]
+
+
+@pytest.fixture(autouse=True)
+def use_mongomock_backend(request, monkeypatch):
+    """
+    Back MongoDBConfig with mongomock unless --real-mongo is given.
+
+    Both the test_db fixtures and the API's get_db dependency go through
+    MongoDBConfig.get_database(), so swapping the cached client and database
+    moves the whole request path onto in-memory collections.
+    """
+    if request.config.getoption("--real-mongo"):
+        yield
+        return
+
+    from src.config.mongodb import MongoDBConfig
+
+    monkeypatch.setattr(
+        MongoDBConfig, "_client", request.getfixturevalue("mongomock_client")
+    )
+    monkeypatch.setattr(MongoDBConfig, "_db", request.getfixturevalue("mongo_test_db"))
+    yield
+
+
+@pytest.fixture(scope="session")
+def ensure_indexes():
+    """
+    Return a helper that creates the production transactions indexes on a db.
+
+    The app lifespan (and so initialize_collections) never runs under
+    TestClient. Call the helper again after dropping the collection, since
+    drop() removes its indexes too.
+    """
+    from src.config.mongodb import MongoDBConfig
+
+    return MongoDBConfig.create_transaction_indexes
+
+
+@pytest.fixture(scope="session")
+def mapping_cache_db(request, mongo_test_db):
+    """
+    Session database with column_mapping_cache in its production layout.
+
+    On mongomock the collection is dropped once, so leftovers from other
+    modules go in a single command. Under --real-mongo other users' entries
+    are kept; tests clear their own users' entries instead.
+    """
+    from src.config.mongodb import MongoDBConfig
+
+    if not request.config.getoption("--real-mongo"):
+        mongo_test_db.column_mapping_cache.drop()
+    MongoDBConfig.create_column_mapping_cache_indexes(mongo_test_db)
+    return mongo_test_db
+
+
+@pytest.fixture(autouse=True)
+def clear_wallet_list_cache():
+    """
+    Start every test with an empty wallet list cache.
+
+    Tests seed and clean wallets directly in the database, bypassing the
+    endpoints that invalidate the cache.
+    """
+    from api.cache import clear_wallet_lists
+
+    clear_wallet_lists()
+    yield
+    clear_wallet_lists()
 
 
 @pytest.fixture
@@ -32,9 +158,15 @@ def unique_test_username():
     return f"testuser_{unique_id}"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_firebase_token():
-    """Create a mock Firebase ID token for testing."""
+    """
+    Create a mock Firebase ID token for testing.
+
+    Session-scoped: verification is mocked without checking expiry, and
+    authenticated endpoints resolve the user via override_auth_dependencies,
+    so one token serves every test.
+    """
     now = int(time.time())
     unique_id = str(uuid.uuid4())[:8]
     email = f"test_{unique_id}@example.com"
@@ -56,14 +188,14 @@ def mock_firebase_token():
     return jwt.encode(payload, "test-secret", algorithm="HS256")
 
 
-@pytest.fixture
-def auth_headers(mock_firebase_token):
-    """Get authentication headers with Firebase token."""
+@pytest.fixture(scope="session")
+def auth_headers(mock_firebase_token, warm_auth_stack):
+    """Get authentication headers with Firebase token (read-only, shared)."""
     return {"Authorization": f"Bearer {mock_firebase_token}"}
 
 
 @pytest.fixture
-def auth_headers_user2():
+def auth_headers_user2(warm_auth_stack):
     """Get authentication headers for second test user."""
     # Create a different mock token for user 2
     now = int(time.time())
@@ -108,15 +240,15 @@ def sample_csv_file(temp_dir, sample_csv_content):
     return filepath
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_dataframe():
-    """Sample DataFrame for testing."""
+    """Sample DataFrame for testing, shared per module; copy before mutating."""
     return pd.DataFrame(
         {
             "asset_name": ["AAPL", "BTC"],
             "date": ["2024-01-10", "2024-01-11"],
             "asset_price": [150.50, 45000.00],
-            "volume": [10, 0.5],
+            "volume": [10.0, 0.5],
             "transaction_amount": [1505.00, 22500.00],
             "fee": [5.0, 10.0],
             "currency": ["USD", "USD"],
@@ -125,19 +257,26 @@ def sample_dataframe():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def valid_financial_record_data():
-    """Valid data for creating TransactionRecord."""
-    return {
-        "asset_name": "AAPL",
-        "date": "2024-01-10",
-        "asset_price": 150.50,
-        "volume": 10,
-        "transaction_amount": 1505.00,
-        "fee": 5.0,
-        "currency": "USD",
-        "transaction_type": "buy",
-    }
+    """
+    Valid data for creating TransactionRecord.
+
+    Shared per module as a read-only mapping; build variants with
+    ``{**valid_financial_record_data, field: value}``.
+    """
+    return MappingProxyType(
+        {
+            "asset_name": "AAPL",
+            "date": "2024-01-10",
+            "asset_price": 150.50,
+            "volume": 10,
+            "transaction_amount": 1505.00,
+            "fee": 5.0,
+            "currency": "USD",
+            "transaction_type": "buy",
+        }
+    )
 
 
 @pytest.fixture
@@ -165,6 +304,110 @@ def set_test_env_vars(monkeypatch):
     monkeypatch.setenv("GENAI_MODEL", "gemini-1.5-flash")
 
 
+def _mock_map_columns(self, source_df, target_columns, sample_rows=5, file_type="csv"):
+    """
+    Mock column mapping with intelligent fallback logic.
+
+    Tries to match columns by name similarity and common patterns.
+    """
+    if source_df.empty:
+        raise ValueError("Cannot map columns from empty DataFrame")
+
+    source_columns = [str(col).lower() for col in source_df.columns]
+    mapping = {}
+
+    # Common column name patterns for different target columns
+    column_patterns = {
+        "wallet_name": ["account", "wallet", "portfel", "konto"],
+        "asset_name": [
+            "stock",
+            "asset",
+            "symbol",
+            "ticker",
+            "nazwa",
+            "instrument",
+            "papier",
+        ],
+        "asset_type": ["type", "asset_type", "typ", "rodzaj"],
+        "date": ["date", "data", "trade_date", "transaction_date", "dt"],
+        "transaction_type": [
+            "transaction_type",
+            "typ_transakcji",
+            "typ",
+            "type",
+        ],
+        "asset_item_price": [
+            "price",
+            "cena",
+            "kurs",
+            "item_price",
+            "unit_price",
+            "asset_price",
+        ],
+        "volume": ["volume", "quantity", "shares", "amount", "ilosc", "liczba"],
+        "transaction_amount": [
+            "total",
+            "amount",
+            "transaction_amount",
+            "wartosc",
+            "kwota",
+        ],
+        "fee": ["fee", "commission", "prowizja", "oplata"],
+        "currency": ["currency", "curr", "waluta", "ccy"],
+        "notes": ["notes", "description", "uwagi", "opis", "comment"],
+    }
+
+    # Try to match each target column
+    for target_col in target_columns:
+        target_lower = target_col.lower()
+        patterns = column_patterns.get(target_col, [target_lower])
+
+        # Try exact match first
+        for i, src_col in enumerate(source_columns):
+            if src_col == target_lower:
+                mapping[target_col] = source_df.columns[i]
+                break
+
+        # Try partial match for common patterns
+        if target_col not in mapping:
+            for i, src_col in enumerate(source_columns):
+                if target_lower in src_col or src_col in target_lower:
+                    mapping[target_col] = source_df.columns[i]
+                    break
+
+        # If no exact match, try pattern matching
+        if target_col not in mapping:
+            for pattern in patterns:
+                for i, src_col in enumerate(source_columns):
+                    if pattern in src_col or src_col in pattern:
+                        mapping[target_col] = source_df.columns[i]
+                        break
+                if target_col in mapping:
+                    break
+
+    return mapping
+
+
+def _mock_column_mapper_init(
+    self, api_key=None, model_name=None, db=None, user_id=None
+):
+    """Stand-in for ColumnMapper.__init__ that needs no API key."""
+    self.api_key = api_key or "mock_key"
+    self.model_name = model_name or "mock_model"
+    self.db = db
+    self.user_id = user_id
+    self.cache_version = 1
+    self.model = MagicMock()
+
+
+def _patch_column_mapper(monkeypatch):
+    """Replace ColumnMapper's AI-backed methods with the offline mocks."""
+    from src.services.column_mapper import ColumnMapper
+
+    monkeypatch.setattr(ColumnMapper, "map_columns", _mock_map_columns)
+    monkeypatch.setattr(ColumnMapper, "__init__", _mock_column_mapper_init)
+
+
 @pytest.fixture(autouse=True)
 def mock_ai_calls_if_needed(request, monkeypatch):
     """
@@ -182,107 +425,36 @@ def mock_ai_calls_if_needed(request, monkeypatch):
     should_mock = not (has_gemini_marker and use_real_ai)
 
     if should_mock:
-        # Mock the ColumnMapper.map_columns method
-        def mock_map_columns(
-            self, source_df, target_columns, sample_rows=5, file_type="csv"
-        ):
-            """
-            Mock column mapping with intelligent fallback logic.
-
-            Tries to match columns by name similarity and common patterns.
-            """
-            if source_df.empty:
-                raise ValueError("Cannot map columns from empty DataFrame")
-
-            source_columns = [str(col).lower() for col in source_df.columns]
-            mapping = {}
-
-            # Common column name patterns for different target columns
-            column_patterns = {
-                "wallet_name": ["account", "wallet", "portfel", "konto"],
-                "asset_name": [
-                    "stock",
-                    "asset",
-                    "symbol",
-                    "ticker",
-                    "nazwa",
-                    "instrument",
-                    "papier",
-                ],
-                "asset_type": ["type", "asset_type", "typ", "rodzaj"],
-                "date": ["date", "data", "trade_date", "transaction_date", "dt"],
-                "transaction_type": [
-                    "transaction_type",
-                    "typ_transakcji",
-                    "typ",
-                    "type",
-                ],
-                "asset_item_price": [
-                    "price",
-                    "cena",
-                    "kurs",
-                    "item_price",
-                    "unit_price",
-                    "asset_price",
-                ],
-                "volume": ["volume", "quantity", "shares", "amount", "ilosc", "liczba"],
-                "transaction_amount": [
-                    "total",
-                    "amount",
-                    "transaction_amount",
-                    "wartosc",
-                    "kwota",
-                ],
-                "fee": ["fee", "commission", "prowizja", "oplata"],
-                "currency": ["currency", "curr", "waluta", "ccy"],
-                "notes": ["notes", "description", "uwagi", "opis", "comment"],
-            }
-
-            # Try to match each target column
-            for target_col in target_columns:
-                target_lower = target_col.lower()
-                patterns = column_patterns.get(target_col, [target_lower])
-
-                # Try exact match first
-                for i, src_col in enumerate(source_columns):
-                    if src_col == target_lower:
-                        mapping[target_col] = source_df.columns[i]
-                        break
-
-                # Try partial match for common patterns
-                if target_col not in mapping:
-                    for i, src_col in enumerate(source_columns):
-                        if target_lower in src_col or src_col in target_lower:
-                            mapping[target_col] = source_df.columns[i]
-                            break
+        _patch_column_mapper(monkeypatch)
 
-                # If no exact match, try pattern matching
-                if target_col not in mapping:
-                    for pattern in patterns:
-                        for i, src_col in enumerate(source_columns):
-                            if pattern in src_col or src_col in pattern:
-                                mapping[target_col] = source_df.columns[i]
-                                break
-                        if target_col in mapping:
-                            break
 
-            return mapping
+@pytest.fixture(scope="module")
+def mock_ai_calls_module():
+    """
+    Module-scoped version of mock_ai_calls_if_needed.
 
-        # Patch the ColumnMapper class
-        from src.services.column_mapper import ColumnMapper
+    For module-scoped fixtures that call the AI-backed services during setup,
+    before the function-scoped mocks are in place.
+    """
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        _patch_column_mapper(monkeypatch)
+        yield
 
-        monkeypatch.setattr(ColumnMapper, "map_columns", mock_map_columns)
 
-        # Also mock the __init__ to avoid requiring API key
-        def mock_init(self, api_key=None, model_name=None, db=None, user_id=None):
-            self.api_key = api_key or "mock_key"
-            self.model_name = model_name or "mock_model"
-            self.db = db
-            self.user_id = user_id
-            self.cache_version = 1
-            self.model = MagicMock()
+@pytest.fixture(scope="session")
+def warm_auth_stack():
+    """
+    Import the auth stack once per session for tests that send auth headers.
 
-        monkeypatch.setattr(ColumnMapper, "__init__", mock_init)
+    mock_firebase_auth imports firebase_admin.auth lazily, so without this
+    the first authenticated test pays the whole import cost. Requested by
+    auth_headers and auth_headers_user2 rather than autouse, so sessions that
+    never call the API don't pay for it.
+    """
+    from firebase_admin import auth as firebase_auth_module  # noqa: F401
+    from api.main import app  # noqa: F401
+    from api.dependencies import get_current_user  # noqa: F401
+    from src.auth.firebase_auth import get_current_user_from_token  # noqa: F401
 
 
 @pytest.fixture(autouse=True, scope="function")
@@ -351,7 +523,14 @@ def override_auth_dependencies():
     bypassing Firebase authentication and user auto-creation logic.
     This fixes 404 errors caused by tests creating wallets for one user ID
     but authentication returning a different auto-created user ID.
+
+    API test modules import the app at module level, so when it isn't loaded
+    nothing can call an endpoint and the override is skipped.
     """
+    if "api.main" not in sys.modules:
+        yield
+        return
+
     from api.main import app
     from api.dependencies import get_current_user
     from src.auth.firebase_auth import get_current_user_from_token
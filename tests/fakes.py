@@ -0,0 +1,27 @@
+"""Lightweight stand-ins for pymongo objects used by the unit tests.
+
+Plain classes are much cheaper to build than ``Mock`` attribute chains and
+behave like the real collection for the calls the routers make.
+"""
+
+
+class FakeWallets:
+    """Wallets collection whose ``aggregate`` returns the preset documents.
+
+    Only the ``$skip`` and ``$limit`` stages are applied; every pipeline is
+    recorded in ``pipelines`` for assertions.
+    """
+
+    def __init__(self, docs=()):
+        self._docs = list(docs)
+        self.pipelines = []
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        docs = self._docs
+        for stage in pipeline:
+            if "$skip" in stage:
+                docs = docs[stage["$skip"] :]
+            elif "$limit" in stage:
+                docs = docs[: stage["$limit"]]
+        return iter(docs)
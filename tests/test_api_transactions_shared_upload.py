@@ -0,0 +1,168 @@
+"""Assertion-only transaction API tests that share one CSV upload."""
+
+import pytest
+from fastapi.testclient import TestClient
+from bson import ObjectId
+from datetime import datetime, UTC
+from unittest.mock import patch
+
+from api.main import app
+from api.dependencies import get_current_user
+from src.auth.firebase_auth import get_current_user_from_token
+from src.config.mongodb import get_db
+
+# Mark all tests in this module as integration tests
+pytestmark = pytest.mark.integration
+
+# Same user override_auth_dependencies authenticates the tests as
+TEST_USER_ID = ObjectId("507f1f77bcf86cd799439011")
+
+SAMPLE_CSV = """Asset Name,Date,Price,Volume,Total,Fee,Currency
+Apple Inc.,2024-01-15,175.50,10,1755.00,2.50,USD
+Microsoft,2024-01-16,420.25,5,2101.25,2.50,USD
+Tesla,2024-01-17,245.80,8,1966.40,3.00,USD
+"""
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Create test client shared by the module."""
+    return TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def shared_uploaded_wallet(mongo_test_db, mock_ai_calls_module, client):
+    """
+    Wallet with SAMPLE_CSV uploaded into it once for the module.
+
+    The upload runs during module setup, before the function-scoped backend,
+    auth and AI fixtures apply, so it overrides get_db and the auth
+    dependencies itself and relies on mock_ai_calls_module. No test here
+    wipes the database; the wallet and its transactions are removed after the
+    module. Returns (wallet_id, upload_json).
+    """
+    db = mongo_test_db
+    now = datetime.now(UTC)
+    wallet_id = db.wallets.insert_one(
+        {
+            "user_id": TEST_USER_ID,
+            "name": f"Shared Upload Test {ObjectId()}",
+            "description": "Test",
+            "created_at": now,
+            "updated_at": now,
+        }
+    ).inserted_id
+
+    async def get_test_user():
+        return TEST_USER_ID
+
+    overrides = {
+        get_db: lambda: db,
+        get_current_user: get_test_user,
+        get_current_user_from_token: get_test_user,
+    }
+    app.dependency_overrides.update(overrides)
+    try:
+        with patch("src.services.transaction_mapper.AssetTypeMapper") as mock_mapper:
+            mock_mapper.return_value.infer_asset_info.return_value = {
+                "asset_type": "stock",
+                "symbol": "TEST",
+                "confidence": 0.9,
+            }
+            response = client.post(
+                "/api/transactions/upload",
+                files={"file": ("transactions.csv", SAMPLE_CSV, "text/csv")},
+                data={"wallet_id": str(wallet_id)},
+            )
+    finally:
+        for dependency in overrides:
+            app.dependency_overrides.pop(dependency, None)
+    assert response.status_code == 200, f"Shared upload failed: {response.text}"
+
+    yield str(wallet_id), response.json()
+
+    # Uploaded transactions may store wallet_id as a string
+    db.transactions.delete_many({"wallet_id": {"$in": [wallet_id, str(wallet_id)]}})
+    db.wallets.delete_one({"_id": wallet_id})
+
+
+class TestTransactionSharedUpload:
+    """Assertion-only tests that share one upload via shared_uploaded_wallet."""
+
+    def test_list_transactions_with_wallet_filter_case_sensitivity(
+        self, client, auth_headers, shared_uploaded_wallet
+    ):
+        """Test wallet filtering with wallet_id (case sensitivity not applicable)."""
+        wallet_id, _ = shared_uploaded_wallet
+
+        # List transactions using wallet_id
+        response = client.get(
+            f"/api/transactions?wallet_id={wallet_id}", headers=auth_headers
+        )
+
+        # Should return transactions
+        assert response.status_code == 200
+
+    def test_upload_with_invalid_asset_type(self, shared_uploaded_wallet):
+        """Test upload with asset types detected automatically."""
+        # Since asset types are now detected automatically from asset names,
+        # this test verifies that the system handles unknown asset types gracefully
+        _, upload_json = shared_uploaded_wallet
+
+        # Should succeed since asset types are determined automatically
+        assert upload_json["status"] == "success"
+
+        # Verify transactions were processed
+        assert upload_json["data"]["summary"]["total_transactions"] > 0
+
+    def test_list_transactions_max_limit_boundary(
+        self, client, auth_headers, shared_uploaded_wallet
+    ):
+        """Test listing transactions with maximum allowed limit."""
+        wallet_id, _ = shared_uploaded_wallet
+
+        # Try with limit=1000 (max allowed)
+        response = client.get(
+            f"/api/transactions?wallet_id={wallet_id}&limit=1000", headers=auth_headers
+        )
+
+        assert response.status_code == 200
+
+    def test_response_format_consistency(
+        self, client, auth_headers, shared_uploaded_wallet
+    ):
+        """Test that upload and list responses have consistent transaction format."""
+        wallet_id, upload_json = shared_uploaded_wallet
+        upload_transactions = upload_json["data"]["transactions"]
+
+        # List transactions
+        list_response = client.get(
+            f"/api/transactions?wallet_id={wallet_id}", headers=auth_headers
+        )
+        list_transactions = list_response.json()["transactions"]
+
+        # Check that required fields are present in both
+        upload_fields = frozenset(
+            (
+                "wallet_name",
+                "asset_name",
+                "date",
+                "volume",
+                "item_price",
+                "transaction_amount",
+                "currency",
+                "fee",
+            )
+        )
+        # Note: list response uses _id instead of id
+        list_fields = frozenset(("_id", "wallet_id", "asset_id"))
+
+        for tx in upload_transactions:
+            assert (
+                upload_fields <= tx.keys()
+            ), f"Missing fields {sorted(upload_fields - tx.keys())} in upload response"
+
+        for tx in list_transactions:
+            assert (
+                list_fields <= tx.keys()
+            ), f"Missing fields {sorted(list_fields - tx.keys())} in list response"
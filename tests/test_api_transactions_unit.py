@@ -1,13 +1,12 @@
 """Unit tests for Transaction API endpoints."""
 
 import pytest
-from unittest.mock import Mock, MagicMock, AsyncMock, patch, mock_open
-from fastapi import HTTPException, UploadFile
+from unittest.mock import Mock, MagicMock, patch
+from fastapi import HTTPException
 from bson import ObjectId
 from datetime import datetime, UTC
-import tempfile
-import os
-from io import BytesIO
+from types import SimpleNamespace
+import itertools
 
 from api.routers.transactions import (
     upload_transactions,
@@ -16,63 +15,151 @@ from api.routers.transactions import (
     delete_wallet_transactions,
 )
 
-# Mark all tests in this module as unit tests
-pytestmark = pytest.mark.unit
+# Mark all tests in this module as unit tests; they await trivial coroutines
+# only, so one event loop is shared across the module.
+pytestmark = [pytest.mark.unit, pytest.mark.asyncio(loop_scope="module")]
+
+# Tests only care that ids are valid and distinct within a test, so hand them
+# out from a pre-generated pool instead of calling ObjectId() everywhere.
+_OID_POOL = [ObjectId() for _ in range(64)]
+_oid_iter = itertools.cycle(_OID_POOL)
+
+
+def _oid():
+    """Return the next ObjectId from the module pool."""
+    return next(_oid_iter)
+
+
+_FIXED_BYTES = b"test,data\n1,2"
+
+# Timestamps are only serialized, never compared to the clock
+_FROZEN_NOW = datetime(2024, 1, 1, tzinfo=UTC)
+
+# Row templates for the pagination tests; list_transactions rewrites rows in
+# place, so tests copy them before use.
+_PAGINATION_ROWS_3 = [
+    {"_id": _oid(), "wallet_id": None, "asset_id": _oid(), "date": _FROZEN_NOW}
+    for _ in range(3)
+]
+
+
+def _upload_file(filename, content_type="text/csv", size=1024, data=_FIXED_BYTES):
+    """Build a lightweight stand-in for ``UploadFile``.
+
+    The endpoint only touches ``filename``, ``content_type``, ``size`` and
+    ``read``, so a namespace is enough and far cheaper than a spec'd Mock.
+    """
+
+    async def read():
+        return data
+
+    return SimpleNamespace(
+        filename=filename, content_type=content_type, size=size, read=read
+    )
+
+
+def _set_paginated_find(coll, result):
+    """Make ``coll.find().sort().skip().limit()`` return ``result``."""
+    coll.find.return_value.sort.return_value.skip.return_value.limit.return_value = (
+        result
+    )
+
+
+@pytest.fixture(scope="module")
+def tx_mock_template():
+    """Canonical upload mock graph, built once per module.
+
+    The endpoint only reads from the transaction mock, so it is shared across
+    tests; anything a test asserts calls on (the database) is built per test
+    by ``_upload_db``.
+    """
+    user_id = _oid()
+    wallet_id = _oid()
+
+    mock_transaction = Mock()
+    mock_transaction.wallet_id = wallet_id
+    mock_transaction.asset_id = _oid()
+    mock_transaction.date = _FROZEN_NOW
+    mock_transaction.transaction_type = Mock(value="buy")
+    mock_transaction.volume = 10.0
+    mock_transaction.item_price = 100.0
+    mock_transaction.transaction_amount = 1000.0
+    mock_transaction.currency = "USD"
+    mock_transaction.fee = 5.0
+    mock_transaction.notes = None
+    mock_transaction.created_at = _FROZEN_NOW
+    mock_transaction.model_dump.return_value = {}
+
+    return SimpleNamespace(
+        user_id=user_id,
+        wallet_id=wallet_id,
+        mock_transaction=mock_transaction,
+        wallet_doc={"_id": wallet_id, "user_id": user_id, "name": "Test Wallet"},
+    )
+
+
+@pytest.fixture
+def ids():
+    """Fresh user/wallet ObjectIds for a single test."""
+    return SimpleNamespace(user=_oid(), wallet=_oid())
+
+
+@pytest.fixture
+def wallet_db(ids):
+    """Mock database whose wallet lookup returns a wallet owned by ``ids.user``."""
+    db = MagicMock()
+    db.wallets.find_one.return_value = {
+        "_id": ids.wallet,
+        "user_id": ids.user,
+        "name": "Test Wallet",
+    }
+    return db
+
+
+def _upload_db(template):
+    """Build a fresh mock database wired for a successful upload."""
+    mock_db = Mock()
+    mock_db.wallets.find_one.return_value = dict(template.wallet_doc)
+    mock_db.transactions.insert_many.return_value.inserted_ids = [_oid()]
+    mock_db.assets.find.return_value = []
+    mock_db.wallets.find.return_value = [
+        {"_id": template.wallet_id, "name": "Test Wallet"}
+    ]
+    return mock_db
 
 
 class TestUploadTransactions:
     """Unit tests for upload_transactions endpoint."""
 
-    @pytest.mark.asyncio
-    async def test_upload_transactions_success(self):
+    @pytest.fixture(autouse=True)
+    def patched_pipeline(self):
+        """Patch DataPipeline for every upload test in this class."""
+        with patch("api.routers.transactions.DataPipeline") as mock_pipeline_class:
+            mock_pipeline_class.return_value.transaction_mapper._asset_cache = {}
+            yield mock_pipeline_class
+
+    async def test_upload_transactions_success(
+        self, tx_mock_template, patched_pipeline
+    ):
         """Test successful transaction upload."""
         # Arrange
-        user_id = ObjectId()
-        wallet_id = ObjectId()
-
-        mock_file = Mock(spec=UploadFile)
-        mock_file.filename = "test.csv"
-        mock_file.content_type = "text/csv"
-        mock_file.size = 1024
-        mock_file.read = AsyncMock(return_value=b"test,data\n1,2")
+        mock_file = _upload_file("test.csv")
 
-        mock_db = Mock()
-        mock_db.wallets.find_one.return_value = {
-            "_id": wallet_id,
-            "user_id": user_id,
-            "name": "Test Wallet",
-        }
+        mock_db = _upload_db(tx_mock_template)
 
-        mock_transaction = Mock()
-        mock_transaction.wallet_id = wallet_id
-        mock_transaction.asset_id = ObjectId()
-        mock_transaction.date = datetime.now(UTC)
-        mock_transaction.transaction_type = Mock(value="buy")
-        mock_transaction.volume = 10.0
-        mock_transaction.item_price = 100.0
-        mock_transaction.transaction_amount = 1000.0
-        mock_transaction.currency = "USD"
-        mock_transaction.fee = 5.0
-        mock_transaction.notes = None
-        mock_transaction.created_at = datetime.now(UTC)
-        mock_transaction.model_dump.return_value = {}
-
-        mock_db.transactions.insert_many.return_value.inserted_ids = [ObjectId()]
-        mock_db.assets.find.return_value = []
-        mock_db.wallets.find.return_value = [{"_id": wallet_id, "name": "Test Wallet"}]
-
-        with patch("api.routers.transactions.DataPipeline") as mock_pipeline_class:
-            mock_pipeline = mock_pipeline_class.return_value
-            mock_pipeline.process_file_to_transactions.return_value = (
-                [mock_transaction],
-                [],
-            )
-            mock_pipeline.transaction_mapper._asset_cache = {}
+        mock_pipeline = patched_pipeline.return_value
+        mock_pipeline.process_file_to_transactions.return_value = (
+            [tx_mock_template.mock_transaction],
+            [],
+        )
 
-            # Act
-            result = await upload_transactions(
-                file=mock_file, wallet_id=str(wallet_id), user_id=user_id, db=mock_db
-            )
+        # Act
+        result = await upload_transactions(
+            file=mock_file,
+            wallet_id=str(tx_mock_template.wallet_id),
+            user_id=tx_mock_template.user_id,
+            db=mock_db,
+        )
 
         # Assert
         assert result["status"] == "success"
@@ -80,146 +167,93 @@ class TestUploadTransactions:
         assert result["data"]["summary"]["total_transactions"] == 1
         assert result["data"]["summary"]["failed_transactions"] == 0
 
-    @pytest.mark.asyncio
-    async def test_upload_transactions_invalid_wallet_id(self):
+    async def test_upload_transactions_invalid_wallet_id(self, ids):
         """Test upload with invalid wallet_id format."""
         # Arrange
-        user_id = ObjectId()
-        mock_file = Mock(spec=UploadFile)
-        mock_file.filename = "test.csv"
+        mock_file = _upload_file("test.csv")
         mock_db = Mock()
 
         # Act & Assert
         with pytest.raises(HTTPException) as exc_info:
             await upload_transactions(
-                file=mock_file, wallet_id="invalid-id", user_id=user_id, db=mock_db
+                file=mock_file, wallet_id="invalid-id", user_id=ids.user, db=mock_db
             )
 
         assert exc_info.value.status_code == 400
         assert "Invalid wallet_id format" in exc_info.value.detail
 
-    @pytest.mark.asyncio
-    async def test_upload_transactions_wallet_not_found(self):
+    async def test_upload_transactions_wallet_not_found(self, wallet_db, ids):
         """Test upload when wallet doesn't exist."""
         # Arrange
-        user_id = ObjectId()
-        wallet_id = ObjectId()
-
-        mock_file = Mock(spec=UploadFile)
-        mock_file.filename = "test.csv"
+        mock_file = _upload_file("test.csv")
 
-        mock_db = Mock()
-        mock_db.wallets.find_one.return_value = None
+        wallet_db.wallets.find_one.return_value = None
 
         # Act & Assert
         with pytest.raises(HTTPException) as exc_info:
             await upload_transactions(
-                file=mock_file, wallet_id=str(wallet_id), user_id=user_id, db=mock_db
+                file=mock_file,
+                wallet_id=str(ids.wallet),
+                user_id=ids.user,
+                db=wallet_db,
             )
 
         assert exc_info.value.status_code == 404
         assert "Wallet not found" in exc_info.value.detail
 
-    @pytest.mark.asyncio
-    async def test_upload_transactions_unsupported_file_type(self):
+    async def test_upload_transactions_unsupported_file_type(self, wallet_db, ids):
         """Test upload with unsupported file type."""
         # Arrange
-        user_id = ObjectId()
-        wallet_id = ObjectId()
-
-        mock_file = Mock(spec=UploadFile)
-        mock_file.filename = "test.pdf"
-        mock_file.content_type = "application/pdf"
-
-        mock_db = Mock()
-        mock_db.wallets.find_one.return_value = {
-            "_id": wallet_id,
-            "user_id": user_id,
-            "name": "Test Wallet",
-        }
+        mock_file = _upload_file("test.pdf", content_type="application/pdf")
 
         # Act & Assert
         with pytest.raises(HTTPException) as exc_info:
             await upload_transactions(
-                file=mock_file, wallet_id=str(wallet_id), user_id=user_id, db=mock_db
+                file=mock_file,
+                wallet_id=str(ids.wallet),
+                user_id=ids.user,
+                db=wallet_db,
             )
 
         assert exc_info.value.status_code == 400
         assert "Unsupported file type" in exc_info.value.detail
 
-    @pytest.mark.asyncio
-    async def test_upload_transactions_no_valid_transactions(self):
+    async def test_upload_transactions_no_valid_transactions(
+        self, tx_mock_template, patched_pipeline
+    ):
         """Test upload when no valid transactions can be created."""
         # Arrange
-        user_id = ObjectId()
-        wallet_id = ObjectId()
+        mock_file = _upload_file("test.csv")
 
-        mock_file = Mock(spec=UploadFile)
-        mock_file.filename = "test.csv"
-        mock_file.content_type = "text/csv"
-        mock_file.size = 1024
-        mock_file.read = AsyncMock(return_value=b"test,data\n1,2")
+        mock_db = _upload_db(tx_mock_template)
 
-        mock_db = Mock()
-        mock_db.wallets.find_one.return_value = {
-            "_id": wallet_id,
-            "user_id": user_id,
-            "name": "Test Wallet",
-        }
+        mock_pipeline = patched_pipeline.return_value
+        mock_pipeline.process_file_to_transactions.return_value = (
+            [],
+            [],
+        )  # No transactions
 
-        with patch("api.routers.transactions.DataPipeline") as mock_pipeline_class:
-            mock_pipeline = mock_pipeline_class.return_value
-            mock_pipeline.process_file_to_transactions.return_value = (
-                [],
-                [],
-            )  # No transactions
-            mock_pipeline.transaction_mapper._asset_cache = {}
-
-            # Act & Assert
-            with pytest.raises(HTTPException) as exc_info:
-                await upload_transactions(
-                    file=mock_file,
-                    wallet_id=str(wallet_id),
-                    user_id=user_id,
-                    db=mock_db,
-                )
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            await upload_transactions(
+                file=mock_file,
+                wallet_id=str(tx_mock_template.wallet_id),
+                user_id=tx_mock_template.user_id,
+                db=mock_db,
+            )
 
         assert exc_info.value.status_code == 422
         assert "No valid transactions" in exc_info.value.detail
 
-    @pytest.mark.asyncio
-    async def test_upload_transactions_with_errors(self):
+    async def test_upload_transactions_with_errors(
+        self, tx_mock_template, patched_pipeline
+    ):
         """Test upload with some errors."""
         # Arrange
-        user_id = ObjectId()
-        wallet_id = ObjectId()
-
-        mock_file = Mock(spec=UploadFile)
-        mock_file.filename = "test.csv"
-        mock_file.content_type = "text/csv"
-        mock_file.size = 1024
-        mock_file.read = AsyncMock(return_value=b"test,data\n1,2")
-
-        mock_db = Mock()
-        mock_db.wallets.find_one.return_value = {
-            "_id": wallet_id,
-            "user_id": user_id,
-            "name": "Test Wallet",
-        }
+        mock_file = _upload_file("test.csv")
 
-        mock_transaction = Mock()
-        mock_transaction.wallet_id = wallet_id
-        mock_transaction.asset_id = ObjectId()
-        mock_transaction.date = datetime.now(UTC)
-        mock_transaction.transaction_type = Mock(value="buy")
-        mock_transaction.volume = 10.0
-        mock_transaction.item_price = 100.0
-        mock_transaction.transaction_amount = 1000.0
-        mock_transaction.currency = "USD"
-        mock_transaction.fee = 5.0
-        mock_transaction.notes = None
-        mock_transaction.created_at = datetime.now(UTC)
-        mock_transaction.model_dump.return_value = {}
+        mock_db = _upload_db(tx_mock_template)
+        mock_db.transaction_errors.insert_many.return_value = Mock()
 
         error_record = {
             "row_index": 2,
@@ -228,23 +262,19 @@ class TestUploadTransactions:
             "error_type": "validation_error",
         }
 
-        mock_db.transactions.insert_many.return_value.inserted_ids = [ObjectId()]
-        mock_db.transaction_errors.insert_many.return_value = Mock()
-        mock_db.assets.find.return_value = []
-        mock_db.wallets.find.return_value = [{"_id": wallet_id, "name": "Test Wallet"}]
-
-        with patch("api.routers.transactions.DataPipeline") as mock_pipeline_class:
-            mock_pipeline = mock_pipeline_class.return_value
-            mock_pipeline.process_file_to_transactions.return_value = (
-                [mock_transaction],
-                [error_record],
-            )
-            mock_pipeline.transaction_mapper._asset_cache = {}
+        mock_pipeline = patched_pipeline.return_value
+        mock_pipeline.process_file_to_transactions.return_value = (
+            [tx_mock_template.mock_transaction],
+            [error_record],
+        )
 
-            # Act
-            result = await upload_transactions(
-                file=mock_file, wallet_id=str(wallet_id), user_id=user_id, db=mock_db
-            )
+        # Act
+        result = await upload_transactions(
+            file=mock_file,
+            wallet_id=str(tx_mock_template.wallet_id),
+            user_id=tx_mock_template.user_id,
+            db=mock_db,
+        )
 
         # Assert
         assert result["status"] == "success"
@@ -252,88 +282,43 @@ class TestUploadTransactions:
         assert result["data"]["summary"]["failed_transactions"] == 1
         mock_db.transaction_errors.insert_many.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_upload_transactions_supported_file_extensions(self):
+    @pytest.mark.parametrize("ext", [".csv", ".txt", ".xls", ".xlsx"])
+    async def test_upload_transactions_supported_file_extensions(
+        self, tx_mock_template, patched_pipeline, ext
+    ):
         """Test that all supported file extensions are accepted."""
-        user_id = ObjectId()
-        wallet_id = ObjectId()
+        mock_file = _upload_file(f"test{ext}")
 
-        supported_extensions = [".csv", ".txt", ".xls", ".xlsx"]
+        mock_db = _upload_db(tx_mock_template)
 
-        for ext in supported_extensions:
-            mock_file = Mock(spec=UploadFile)
-            mock_file.filename = f"test{ext}"
-            mock_file.read = AsyncMock(return_value=b"test,data\n1,2")
+        mock_pipeline = patched_pipeline.return_value
+        mock_pipeline.process_file_to_transactions.return_value = (
+            [tx_mock_template.mock_transaction],
+            [],
+        )
 
-            mock_db = Mock()
-            mock_db.wallets.find_one.return_value = {
-                "_id": wallet_id,
-                "user_id": user_id,
-                "name": "Test Wallet",
-            }
+        # Should not raise exception
+        result = await upload_transactions(
+            file=mock_file,
+            wallet_id=str(tx_mock_template.wallet_id),
+            user_id=tx_mock_template.user_id,
+            db=mock_db,
+        )
 
-            mock_transaction = Mock()
-            mock_transaction.wallet_id = wallet_id
-            mock_transaction.asset_id = ObjectId()
-            mock_transaction.date = datetime.now(UTC)
-            mock_transaction.transaction_type = Mock(value="buy")
-            mock_transaction.volume = 10.0
-            mock_transaction.item_price = 100.0
-            mock_transaction.transaction_amount = 1000.0
-            mock_transaction.currency = "USD"
-            mock_transaction.fee = 5.0
-            mock_transaction.notes = None
-            mock_transaction.created_at = datetime.now(UTC)
-            mock_transaction.model_dump.return_value = {}
-
-            mock_db.transactions.insert_many.return_value.inserted_ids = [ObjectId()]
-            mock_db.assets.find.return_value = []
-            mock_db.wallets.find.return_value = [
-                {"_id": wallet_id, "name": "Test Wallet"}
-            ]
-
-            with patch("api.routers.transactions.DataPipeline") as mock_pipeline_class:
-                mock_pipeline = mock_pipeline_class.return_value
-                mock_pipeline.process_file_to_transactions.return_value = (
-                    [mock_transaction],
-                    [],
-                )
-                mock_pipeline.transaction_mapper._asset_cache = {}
-
-                # Should not raise exception
-                result = await upload_transactions(
-                    file=mock_file,
-                    wallet_id=str(wallet_id),
-                    user_id=user_id,
-                    db=mock_db,
-                )
-
-                assert result["status"] == "success"
+        assert result["status"] == "success"
 
 
 class TestListTransactions:
     """Unit tests for list_transactions endpoint."""
 
-    @pytest.mark.asyncio
-    async def test_list_transactions_empty(self):
+    async def test_list_transactions_empty(self, wallet_db, ids):
         """Test listing transactions when none exist."""
         # Arrange
-        user_id = ObjectId()
-        wallet_id = ObjectId()
-
-        mock_db = Mock()
-        mock_db.wallets.find_one.return_value = {
-            "_id": wallet_id,
-            "user_id": user_id,
-            "name": "Test Wallet",
-        }
-        mock_db.transactions.find.return_value.sort.return_value.skip.return_value.limit.return_value = (
-            []
-        )
+        _set_paginated_find(wallet_db.transactions, [])
 
         # Act
         result = await list_transactions(
-            wallet_id=str(wallet_id), limit=100, skip=0, db=mock_db, user_id=user_id
+            wallet_id=str(ids.wallet), limit=100, skip=0, db=wallet_db, user_id=ids.user
         )
 
         # Assert
@@ -342,41 +327,30 @@ class TestListTransactions:
         assert result["has_next"] is False
         assert result["has_prev"] is False
 
-    @pytest.mark.asyncio
-    async def test_list_transactions_with_data(self):
+    async def test_list_transactions_with_data(self, wallet_db, ids):
         """Test listing transactions with data."""
         # Arrange
-        user_id = ObjectId()
-        wallet_id = ObjectId()
-        asset_id = ObjectId()
-        transaction_id = ObjectId()
+        asset_id = _oid()
+        transaction_id = _oid()
 
         mock_transactions = [
             {
                 "_id": transaction_id,
-                "wallet_id": wallet_id,
+                "wallet_id": ids.wallet,
                 "asset_id": asset_id,
-                "date": datetime.now(UTC),
+                "date": _FROZEN_NOW,
                 "transaction_type": "buy",
                 "volume": 10.0,
                 "item_price": 100.0,
                 "transaction_amount": 1000.0,
                 "currency": "USD",
                 "fee": 5.0,
-                "created_at": datetime.now(UTC),
+                "created_at": _FROZEN_NOW,
             }
         ]
 
-        mock_db = Mock()
-        mock_db.wallets.find_one.return_value = {
-            "_id": wallet_id,
-            "user_id": user_id,
-            "name": "Test Wallet",
-        }
-        mock_db.transactions.find.return_value.sort.return_value.skip.return_value.limit.return_value = (
-            mock_transactions
-        )
-        mock_db.assets.find_one.return_value = {
+        _set_paginated_find(wallet_db.transactions, mock_transactions)
+        wallet_db.assets.find_one.return_value = {
             "_id": asset_id,
             "asset_name": "Test Asset",
             "asset_type": "stock",
@@ -384,7 +358,7 @@ class TestListTransactions:
 
         # Act
         result = await list_transactions(
-            wallet_id=str(wallet_id), limit=100, skip=0, db=mock_db, user_id=user_id
+            wallet_id=str(ids.wallet), limit=100, skip=0, db=wallet_db, user_id=ids.user
         )
 
         # Assert
@@ -394,76 +368,55 @@ class TestListTransactions:
         assert result["transactions"][0]["wallet_name"] == "Test Wallet"
         assert result["transactions"][0]["asset_name"] == "Test Asset"
 
-    @pytest.mark.asyncio
-    async def test_list_transactions_invalid_wallet_id(self):
+    async def test_list_transactions_invalid_wallet_id(self, ids):
         """Test listing with invalid wallet_id format."""
         # Arrange
-        user_id = ObjectId()
         mock_db = Mock()
 
         # Act & Assert
         with pytest.raises(HTTPException) as exc_info:
             await list_transactions(
-                wallet_id="invalid-id", limit=100, skip=0, db=mock_db, user_id=user_id
+                wallet_id="invalid-id", limit=100, skip=0, db=mock_db, user_id=ids.user
             )
 
         assert exc_info.value.status_code == 400
         assert "Invalid wallet_id format" in exc_info.value.detail
 
-    @pytest.mark.asyncio
-    async def test_list_transactions_wallet_not_found(self):
+    async def test_list_transactions_wallet_not_found(self, wallet_db, ids):
         """Test listing when wallet doesn't exist."""
         # Arrange
-        user_id = ObjectId()
-        wallet_id = ObjectId()
-
-        mock_db = Mock()
-        mock_db.wallets.find_one.return_value = None
+        wallet_db.wallets.find_one.return_value = None
 
         # Act & Assert
         with pytest.raises(HTTPException) as exc_info:
             await list_transactions(
-                wallet_id=str(wallet_id), limit=100, skip=0, db=mock_db, user_id=user_id
+                wallet_id=str(ids.wallet),
+                limit=100,
+                skip=0,
+                db=wallet_db,
+                user_id=ids.user,
             )
 
         assert exc_info.value.status_code == 404
         assert "Wallet not found" in exc_info.value.detail
 
-    @pytest.mark.asyncio
-    async def test_list_transactions_pagination_has_next(self):
+    async def test_list_transactions_pagination_has_next(self, wallet_db, ids):
         """Test pagination with has_next indicator."""
         # Arrange
-        user_id = ObjectId()
-        wallet_id = ObjectId()
-
         # Create 3 transactions when limit is 2, so has_next should be True
         mock_transactions = [
-            {
-                "_id": ObjectId(),
-                "wallet_id": wallet_id,
-                "asset_id": ObjectId(),
-                "date": datetime.now(UTC),
-            }
-            for _ in range(3)
+            {**row, "wallet_id": ids.wallet} for row in _PAGINATION_ROWS_3
         ]
 
-        mock_db = Mock()
-        mock_db.wallets.find_one.return_value = {
-            "_id": wallet_id,
-            "user_id": user_id,
-            "name": "Test Wallet",
-        }
-        mock_db.transactions.find.return_value.sort.return_value.skip.return_value.limit.return_value = (
-            mock_transactions
-        )
-        mock_db.assets.find_one.return_value = {
+        _set_paginated_find(wallet_db.transactions, mock_transactions)
+        wallet_db.assets.find_one.return_value = {
             "asset_name": "Test",
             "asset_type": "stock",
         }
 
         # Act
         result = await list_transactions(
-            wallet_id=str(wallet_id), limit=2, skip=0, db=mock_db, user_id=user_id
+            wallet_id=str(ids.wallet), limit=2, skip=0, db=wallet_db, user_id=ids.user
         )
 
         # Assert
@@ -471,80 +424,51 @@ class TestListTransactions:
         assert result["has_prev"] is False
         assert result["count"] == 2  # Should only return limit amount
 
-    @pytest.mark.asyncio
-    async def test_list_transactions_pagination_has_prev(self):
+    async def test_list_transactions_pagination_has_prev(self, wallet_db, ids):
         """Test pagination with has_prev indicator."""
         # Arrange
-        user_id = ObjectId()
-        wallet_id = ObjectId()
-
         mock_transactions = [
-            {
-                "_id": ObjectId(),
-                "wallet_id": wallet_id,
-                "asset_id": ObjectId(),
-                "date": datetime.now(UTC),
-            }
-            for _ in range(2)
+            {**row, "wallet_id": ids.wallet} for row in _PAGINATION_ROWS_3[:2]
         ]
 
-        mock_db = Mock()
-        mock_db.wallets.find_one.return_value = {
-            "_id": wallet_id,
-            "user_id": user_id,
-            "name": "Test Wallet",
-        }
-        mock_db.transactions.find.return_value.sort.return_value.skip.return_value.limit.return_value = (
-            mock_transactions
-        )
-        mock_db.assets.find_one.return_value = {
+        _set_paginated_find(wallet_db.transactions, mock_transactions)
+        wallet_db.assets.find_one.return_value = {
             "asset_name": "Test",
             "asset_type": "stock",
         }
 
         # Act
         result = await list_transactions(
-            wallet_id=str(wallet_id),
+            wallet_id=str(ids.wallet),
             limit=2,
             skip=5,  # Skip > 0 means there are previous pages
-            db=mock_db,
-            user_id=user_id,
+            db=wallet_db,
+            user_id=ids.user,
         )
 
         # Assert
         assert result["has_prev"] is True
 
-    @pytest.mark.asyncio
-    async def test_list_transactions_missing_asset(self):
+    async def test_list_transactions_missing_asset(self, wallet_db, ids):
         """Test listing transactions when asset doesn't exist."""
         # Arrange
-        user_id = ObjectId()
-        wallet_id = ObjectId()
-        asset_id = ObjectId()
+        asset_id = _oid()
 
         mock_transactions = [
             {
-                "_id": ObjectId(),
-                "wallet_id": wallet_id,
+                "_id": _oid(),
+                "wallet_id": ids.wallet,
                 "asset_id": asset_id,
-                "date": datetime.now(UTC),
+                "date": _FROZEN_NOW,
             }
         ]
 
-        mock_db = Mock()
-        mock_db.wallets.find_one.return_value = {
-            "_id": wallet_id,
-            "user_id": user_id,
-            "name": "Test Wallet",
-        }
-        mock_db.transactions.find.return_value.sort.return_value.skip.return_value.limit.return_value = (
-            mock_transactions
-        )
-        mock_db.assets.find_one.return_value = None  # Asset not found
+        _set_paginated_find(wallet_db.transactions, mock_transactions)
+        wallet_db.assets.find_one.return_value = None  # Asset not found
 
         # Act
         result = await list_transactions(
-            wallet_id=str(wallet_id), limit=100, skip=0, db=mock_db, user_id=user_id
+            wallet_id=str(ids.wallet), limit=100, skip=0, db=wallet_db, user_id=ids.user
         )
 
         # Assert
@@ -555,15 +479,11 @@ class TestListTransactions:
 class TestListTransactionErrors:
     """Unit tests for list_transaction_errors endpoint."""
 
-    @pytest.mark.asyncio
-    async def test_list_errors_empty(self):
+    async def test_list_errors_empty(self, ids):
         """Test listing errors when none exist."""
         # Arrange
-        user_id = ObjectId()
         mock_db = Mock()
-        mock_db.transaction_errors.find.return_value.sort.return_value.skip.return_value.limit.return_value = (
-            []
-        )
+        _set_paginated_find(mock_db.transaction_errors, [])
 
         # Act
         result = await list_transaction_errors(
@@ -571,7 +491,7 @@ class TestListTransactionErrors:
             resolved=None,
             limit=100,
             skip=0,
-            user_id=user_id,
+            user_id=ids.user,
             db=mock_db,
         )
 
@@ -580,17 +500,15 @@ class TestListTransactionErrors:
         assert result["count"] == 0
         assert result["errors"] == []
 
-    @pytest.mark.asyncio
-    async def test_list_errors_with_data(self):
+    async def test_list_errors_with_data(self, ids):
         """Test listing errors with data."""
         # Arrange
-        user_id = ObjectId()
-        error_id = ObjectId()
+        error_id = _oid()
 
         mock_errors = [
             {
                 "_id": error_id,
-                "user_id": user_id,
+                "user_id": ids.user,
                 "wallet_name": "Test Wallet",
                 "filename": "test.csv",
                 "row_index": 1,
@@ -601,9 +519,7 @@ class TestListTransactionErrors:
         ]
 
         mock_db = Mock()
-        mock_db.transaction_errors.find.return_value.sort.return_value.skip.return_value.limit.return_value = (
-            mock_errors
-        )
+        _set_paginated_find(mock_db.transaction_errors, mock_errors)
 
         # Act
         result = await list_transaction_errors(
@@ -611,7 +527,7 @@ class TestListTransactionErrors:
             resolved=None,
             limit=100,
             skip=0,
-            user_id=user_id,
+            user_id=ids.user,
             db=mock_db,
         )
 
@@ -620,47 +536,31 @@ class TestListTransactionErrors:
         assert result["count"] == 1
         assert result["errors"][0]["_id"] == str(error_id)
 
-    @pytest.mark.asyncio
-    async def test_list_errors_filter_by_wallet(self):
+    async def test_list_errors_filter_by_wallet(self, wallet_db, ids):
         """Test filtering errors by wallet_id."""
         # Arrange
-        user_id = ObjectId()
-        wallet_id = ObjectId()
-
-        mock_db = Mock()
-        mock_db.wallets.find_one.return_value = {
-            "_id": wallet_id,
-            "user_id": user_id,
-            "name": "Test Wallet",
-        }
-        mock_db.transaction_errors.find.return_value.sort.return_value.skip.return_value.limit.return_value = (
-            []
-        )
+        _set_paginated_find(wallet_db.transaction_errors, [])
 
         # Act
         await list_transaction_errors(
-            wallet_id=str(wallet_id),
+            wallet_id=str(ids.wallet),
             resolved=None,
             limit=100,
             skip=0,
-            user_id=user_id,
-            db=mock_db,
+            user_id=ids.user,
+            db=wallet_db,
         )
 
         # Assert - verify query includes wallet_id
-        call_args = mock_db.transaction_errors.find.call_args[0][0]
+        call_args = wallet_db.transaction_errors.find.call_args[0][0]
         assert "wallet_id" in call_args
-        assert call_args["wallet_id"] == wallet_id
+        assert call_args["wallet_id"] == ids.wallet
 
-    @pytest.mark.asyncio
-    async def test_list_errors_filter_by_resolved(self):
+    async def test_list_errors_filter_by_resolved(self, ids):
         """Test filtering errors by resolved status."""
         # Arrange
-        user_id = ObjectId()
         mock_db = Mock()
-        mock_db.transaction_errors.find.return_value.sort.return_value.skip.return_value.limit.return_value = (
-            []
-        )
+        _set_paginated_find(mock_db.transaction_errors, [])
 
         # Act
         await list_transaction_errors(
@@ -668,7 +568,7 @@ class TestListTransactionErrors:
             resolved=True,
             limit=100,
             skip=0,
-            user_id=user_id,
+            user_id=ids.user,
             db=mock_db,
         )
 
@@ -677,11 +577,9 @@ class TestListTransactionErrors:
         assert "resolved" in call_args
         assert call_args["resolved"] is True
 
-    @pytest.mark.asyncio
-    async def test_list_errors_invalid_wallet_id(self):
+    async def test_list_errors_invalid_wallet_id(self, ids):
         """Test filtering with invalid wallet_id format."""
         # Arrange
-        user_id = ObjectId()
         mock_db = Mock()
 
         # Act & Assert
@@ -691,32 +589,27 @@ class TestListTransactionErrors:
                 resolved=None,
                 limit=100,
                 skip=0,
-                user_id=user_id,
+                user_id=ids.user,
                 db=mock_db,
             )
 
         assert exc_info.value.status_code == 400
         assert "Invalid wallet_id format" in exc_info.value.detail
 
-    @pytest.mark.asyncio
-    async def test_list_errors_wallet_not_found(self):
+    async def test_list_errors_wallet_not_found(self, wallet_db, ids):
         """Test filtering when wallet doesn't exist."""
         # Arrange
-        user_id = ObjectId()
-        wallet_id = ObjectId()
-
-        mock_db = Mock()
-        mock_db.wallets.find_one.return_value = None
+        wallet_db.wallets.find_one.return_value = None
 
         # Act & Assert
         with pytest.raises(HTTPException) as exc_info:
             await list_transaction_errors(
-                wallet_id=str(wallet_id),
+                wallet_id=str(ids.wallet),
                 resolved=None,
                 limit=100,
                 skip=0,
-                user_id=user_id,
-                db=mock_db,
+                user_id=ids.user,
+                db=wallet_db,
             )
 
         assert exc_info.value.status_code == 404
@@ -726,113 +619,77 @@ class TestListTransactionErrors:
 class TestDeleteWalletTransactions:
     """Unit tests for delete_wallet_transactions endpoint."""
 
-    @pytest.mark.asyncio
-    async def test_delete_transactions_success(self):
+    async def test_delete_transactions_success(self, wallet_db, ids):
         """Test successful transaction deletion."""
         # Arrange
-        user_id = ObjectId()
-        wallet_id = ObjectId()
-
-        mock_db = Mock()
-        mock_db.wallets.find_one.return_value = {
-            "_id": wallet_id,
-            "user_id": user_id,
-            "name": "Test Wallet",
-        }
-        mock_db.transactions.delete_many.return_value.deleted_count = 5
+        wallet_db.transactions.delete_many.return_value.deleted_count = 5
 
         # Act
         result = await delete_wallet_transactions(
-            wallet_id=str(wallet_id), user_id=user_id, db=mock_db
+            wallet_id=str(ids.wallet), user_id=ids.user, db=wallet_db
         )
 
         # Assert
         assert result["status"] == "success"
         assert result["wallet_name"] == "Test Wallet"
         assert result["deleted_count"] == 5
-        mock_db.transactions.delete_many.assert_called_once()
+        wallet_db.transactions.delete_many.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_delete_transactions_invalid_wallet_id(self):
+    async def test_delete_transactions_invalid_wallet_id(self, ids):
         """Test deletion with invalid wallet_id format."""
         # Arrange
-        user_id = ObjectId()
         mock_db = Mock()
 
         # Act & Assert
         with pytest.raises(HTTPException) as exc_info:
             await delete_wallet_transactions(
-                wallet_id="invalid-id", user_id=user_id, db=mock_db
+                wallet_id="invalid-id", user_id=ids.user, db=mock_db
             )
 
         assert exc_info.value.status_code == 400
         assert "Invalid wallet_id format" in exc_info.value.detail
 
-    @pytest.mark.asyncio
-    async def test_delete_transactions_wallet_not_found(self):
+    async def test_delete_transactions_wallet_not_found(self, wallet_db, ids):
         """Test deletion when wallet doesn't exist."""
         # Arrange
-        user_id = ObjectId()
-        wallet_id = ObjectId()
-
-        mock_db = Mock()
-        mock_db.wallets.find_one.return_value = None
+        wallet_db.wallets.find_one.return_value = None
 
         # Act & Assert
         with pytest.raises(HTTPException) as exc_info:
             await delete_wallet_transactions(
-                wallet_id=str(wallet_id), user_id=user_id, db=mock_db
+                wallet_id=str(ids.wallet), user_id=ids.user, db=wallet_db
             )
 
         assert exc_info.value.status_code == 404
         assert "Wallet not found or not owned by user" in exc_info.value.detail
 
-    @pytest.mark.asyncio
-    async def test_delete_transactions_empty_wallet(self):
+    async def test_delete_transactions_empty_wallet(self, wallet_db, ids):
         """Test deleting transactions from empty wallet."""
         # Arrange
-        user_id = ObjectId()
-        wallet_id = ObjectId()
-
-        mock_db = Mock()
-        mock_db.wallets.find_one.return_value = {
-            "_id": wallet_id,
-            "user_id": user_id,
-            "name": "Empty Wallet",
-        }
-        mock_db.transactions.delete_many.return_value.deleted_count = 0
+        wallet_db.wallets.find_one.return_value["name"] = "Empty Wallet"
+        wallet_db.transactions.delete_many.return_value.deleted_count = 0
 
         # Act
         result = await delete_wallet_transactions(
-            wallet_id=str(wallet_id), user_id=user_id, db=mock_db
+            wallet_id=str(ids.wallet), user_id=ids.user, db=wallet_db
         )
 
         # Assert
         assert result["status"] == "success"
         assert result["deleted_count"] == 0
 
-    @pytest.mark.asyncio
-    async def test_delete_transactions_checks_both_formats(self):
+    async def test_delete_transactions_checks_both_formats(self, wallet_db, ids):
         """Test that deletion handles both ObjectId and string formats."""
         # Arrange
-        user_id = ObjectId()
-        wallet_id = ObjectId()
-
-        mock_db = Mock()
-        mock_db.wallets.find_one.return_value = {
-            "_id": wallet_id,
-            "user_id": user_id,
-            "name": "Test Wallet",
-        }
-        mock_db.transactions.delete_many.return_value.deleted_count = 3
+        wallet_db.transactions.delete_many.return_value.deleted_count = 3
 
         # Act
         await delete_wallet_transactions(
-            wallet_id=str(wallet_id), user_id=user_id, db=mock_db
+            wallet_id=str(ids.wallet), user_id=ids.user, db=wallet_db
         )
 
         # Assert - verify deletion query handles both formats
-        call_args = mock_db.transactions.delete_many.call_args[0][0]
+        call_args = wallet_db.transactions.delete_many.call_args[0][0]
         assert "$or" in call_args
-        assert {"wallet_id": wallet_id} in call_args["$or"]
-        assert {"wallet_id": str(wallet_id)} in call_args["$or"]
+        assert {"wallet_id": ids.wallet} in call_args["$or"]
+        assert {"wallet_id": str(ids.wallet)} in call_args["$or"]
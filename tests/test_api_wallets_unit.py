@@ -2,163 +2,205 @@
 
 import pytest
 from unittest.mock import Mock, MagicMock, AsyncMock
+from pymongo.collection import Collection
+from pymongo.database import Database
 from fastapi import HTTPException
+from pydantic import ValidationError
 from bson import ObjectId
 from datetime import datetime, UTC
+from types import SimpleNamespace
 
+import api.cache
+from api.cache import get_wallet_list, set_wallet_list
 from api.routers.wallets import (
     list_wallets,
     create_wallet,
     delete_wallet,
     WalletCreate,
 )
+from tests.fakes import FakeWallets
 
 # Mark all tests in this module as unit tests
 pytestmark = pytest.mark.unit
 
+NOW = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+@pytest.fixture(scope="module")
+def sample_user_id():
+    """One authenticated user id shared by every test in the module."""
+    return ObjectId()
+
+
+@pytest.fixture(scope="module")
+def sample_wallet_create():
+    """Validated wallet payload; WalletCreate is immutable in use here."""
+    return WalletCreate(name="My Wallet", description="Test description")
+
+
+def _spec_db():
+    """Mock database restricted to the pymongo API.
+
+    Only the collections the wallet router touches are attached, so a typo
+    in a collection or method name fails instead of auto-creating a child.
+    """
+    mock_db = MagicMock(spec=Database)
+    mock_db.wallets = MagicMock(spec=Collection)
+    mock_db.transactions = MagicMock(spec=Collection)
+    return mock_db
+
+
+@pytest.fixture
+def mock_db():
+    """Fresh spec'd mock database for each test."""
+    return _spec_db()
+
+
+def make_create_wallet_db(user_id, wallet_id, name, description=None):
+    """Build a mock database wired for a successful ``create_wallet`` call.
+
+    The first ``find_one`` (duplicate check) finds nothing; the second returns
+    the stored wallet.
+    """
+    mock_db = _spec_db()
+    mock_db.wallets.insert_one.return_value.inserted_id = wallet_id
+    mock_db.wallets.find_one.side_effect = [
+        None,
+        {
+            "_id": wallet_id,
+            "user_id": user_id,
+            "name": name,
+            "description": description,
+        },
+    ]
+    return mock_db
+
 
 class TestListWallets:
     """Unit tests for list_wallets endpoint."""
 
-    @pytest.mark.asyncio
-    async def test_list_wallets_empty(self):
+    async def test_list_wallets_empty(self, sample_user_id):
         """Test listing wallets when user has none."""
         # Arrange
-        mock_db = Mock()
-        mock_db.wallets.find.return_value.skip.return_value.limit.return_value = []
-        user_id = ObjectId()
+        mock_db = SimpleNamespace(wallets=FakeWallets())
 
         # Act
-        result = await list_wallets(limit=100, skip=0, user_id=user_id, db=mock_db)
+        result = await list_wallets(
+            limit=100, skip=0, user_id=sample_user_id, db=mock_db
+        )
 
         # Assert
         assert result == {"wallets": [], "count": 0}
-        mock_db.wallets.find.assert_called_once()
+        assert len(mock_db.wallets.pipelines) == 1
 
-    @pytest.mark.asyncio
-    async def test_list_wallets_with_data(self):
+    async def test_list_wallets_with_data(self, sample_user_id):
         """Test listing wallets with data."""
         # Arrange
-        user_id = ObjectId()
-        wallet1_id = ObjectId()
-        wallet2_id = ObjectId()
+        wallet1_id = str(ObjectId())
+        wallet2_id = str(ObjectId())
 
+        # Documents as returned by the pipeline, ids already strings
         mock_wallets = [
             {
                 "_id": wallet1_id,
-                "user_id": user_id,
+                "user_id": str(sample_user_id),
                 "name": "Wallet 1",
                 "description": "Test wallet 1",
-                "created_at": datetime.now(UTC),
-                "updated_at": datetime.now(UTC),
+                "created_at": NOW,
+                "updated_at": NOW,
             },
             {
                 "_id": wallet2_id,
-                "user_id": user_id,
+                "user_id": str(sample_user_id),
                 "name": "Wallet 2",
                 "description": "Test wallet 2",
-                "created_at": datetime.now(UTC),
-                "updated_at": datetime.now(UTC),
+                "created_at": NOW,
+                "updated_at": NOW,
             },
         ]
 
-        mock_db = Mock()
-        mock_db.wallets.find.return_value.skip.return_value.limit.return_value = (
-            mock_wallets
-        )
+        mock_db = SimpleNamespace(wallets=FakeWallets(mock_wallets))
 
         # Act
-        result = await list_wallets(limit=100, skip=0, user_id=user_id, db=mock_db)
+        result = await list_wallets(
+            limit=100, skip=0, user_id=sample_user_id, db=mock_db
+        )
 
         # Assert
         assert result["count"] == 2
         assert len(result["wallets"]) == 2
-        assert result["wallets"][0]["_id"] == str(wallet1_id)
-        assert result["wallets"][1]["_id"] == str(wallet2_id)
-        assert result["wallets"][0]["user_id"] == str(user_id)
+        assert result["wallets"][0]["_id"] == wallet1_id
+        assert result["wallets"][1]["_id"] == wallet2_id
+        assert result["wallets"][0]["user_id"] == str(sample_user_id)
 
-    @pytest.mark.asyncio
-    async def test_list_wallets_with_pagination(self):
+    async def test_list_wallets_with_pagination(self, sample_user_id):
         """Test list wallets with skip and limit parameters."""
         # Arrange
-        user_id = ObjectId()
         mock_wallets = [
-            {"_id": ObjectId(), "user_id": user_id, "name": f"Wallet {i}"}
+            {
+                "_id": str(ObjectId()),
+                "user_id": str(sample_user_id),
+                "name": f"Wallet {i}",
+            }
             for i in range(5)
         ]
 
-        mock_db = Mock()
-        mock_db.wallets.find.return_value.skip.return_value.limit.return_value = (
-            mock_wallets[:2]
-        )
+        mock_db = SimpleNamespace(wallets=FakeWallets(mock_wallets))
 
         # Act
-        result = await list_wallets(limit=2, skip=3, user_id=user_id, db=mock_db)
+        result = await list_wallets(limit=2, skip=3, user_id=sample_user_id, db=mock_db)
 
         # Assert
         assert result["count"] == 2
-        mock_find = mock_db.wallets.find.return_value
-        mock_find.skip.assert_called_once_with(3)
-        mock_find.skip.return_value.limit.assert_called_once_with(2)
+        pipeline = mock_db.wallets.pipelines[0]
+        assert {"$skip": 3} in pipeline
+        assert {"$limit": 2} in pipeline
+        assert [w["name"] for w in result["wallets"]] == ["Wallet 3", "Wallet 4"]
 
-    @pytest.mark.asyncio
-    async def test_list_wallets_converts_objectids_to_strings(self):
-        """Test that ObjectIds are converted to strings for JSON serialization."""
+    async def test_list_wallets_converts_ids_server_side(self, sample_user_id):
+        """Test that ObjectIds are converted to strings by the aggregation."""
         # Arrange
-        user_id = ObjectId()
-        wallet_id = ObjectId()
-
         mock_wallets = [
             {
-                "_id": wallet_id,
-                "user_id": user_id,
+                "_id": str(ObjectId()),
+                "user_id": str(sample_user_id),
                 "name": "Test Wallet",
             }
         ]
 
-        mock_db = Mock()
-        mock_db.wallets.find.return_value.skip.return_value.limit.return_value = (
-            mock_wallets
-        )
+        mock_db = SimpleNamespace(wallets=FakeWallets(mock_wallets))
 
         # Act
-        result = await list_wallets(limit=100, skip=0, user_id=user_id, db=mock_db)
+        result = await list_wallets(
+            limit=100, skip=0, user_id=sample_user_id, db=mock_db
+        )
 
         # Assert
-        assert isinstance(result["wallets"][0]["_id"], str)
-        assert isinstance(result["wallets"][0]["user_id"], str)
-        assert result["wallets"][0]["_id"] == str(wallet_id)
-        assert result["wallets"][0]["user_id"] == str(user_id)
+        pipeline = mock_db.wallets.pipelines[0]
+        assert pipeline[0] == {"$match": {"user_id": sample_user_id}}
+        assert pipeline[-1] == {
+            "$addFields": {
+                "_id": {"$toString": "$_id"},
+                "user_id": {"$toString": "$user_id"},
+            }
+        }
+        # Documents are returned untouched, no Python-side conversion
+        assert result["wallets"][0] is mock_wallets[0]
 
 
 class TestCreateWallet:
     """Unit tests for create_wallet endpoint."""
 
-    @pytest.mark.asyncio
-    async def test_create_wallet_success(self):
+    async def test_create_wallet_success(self, sample_user_id, sample_wallet_create):
         """Test successful wallet creation."""
         # Arrange
-        user_id = ObjectId()
-        wallet_data = WalletCreate(name="My Wallet", description="Test description")
-
-        mock_db = Mock()
-        mock_db.wallets.find_one.return_value = None  # No existing wallet
-
-        wallet_id = ObjectId()
-        mock_db.wallets.insert_one.return_value.inserted_id = wallet_id
-        mock_db.wallets.find_one.side_effect = [
-            None,  # First call: check for existing wallet
-            {  # Second call: get created wallet
-                "_id": wallet_id,
-                "user_id": user_id,
-                "name": "My Wallet",
-                "description": "Test description",
-            },
-        ]
+        mock_db = make_create_wallet_db(
+            sample_user_id, ObjectId(), "My Wallet", "Test description"
+        )
 
         # Act
         result = await create_wallet(
-            wallet_data=wallet_data, user_id=user_id, db=mock_db
+            wallet_data=sample_wallet_create, user_id=sample_user_id, db=mock_db
         )
 
         # Assert
@@ -167,130 +209,101 @@ class TestCreateWallet:
         assert result["data"]["name"] == "My Wallet"
         assert result["data"]["description"] == "Test description"
         mock_db.wallets.insert_one.assert_called_once()
+        inserted = mock_db.wallets.insert_one.call_args[0][0]
+        # Owner must be stored as ObjectId so ownership queries match it
+        assert type(inserted["user_id"]) is ObjectId
+        assert inserted["user_id"] == sample_user_id
 
-    @pytest.mark.asyncio
-    async def test_create_wallet_without_description(self):
+    async def test_create_wallet_without_description(self, sample_user_id):
         """Test creating wallet without optional description."""
         # Arrange
-        user_id = ObjectId()
         wallet_data = WalletCreate(name="Simple Wallet")
 
-        mock_db = Mock()
-        mock_db.wallets.find_one.return_value = None
-
-        wallet_id = ObjectId()
-        mock_db.wallets.insert_one.return_value.inserted_id = wallet_id
-        mock_db.wallets.find_one.side_effect = [
-            None,
-            {
-                "_id": wallet_id,
-                "user_id": user_id,
-                "name": "Simple Wallet",
-                "description": None,
-            },
-        ]
+        mock_db = make_create_wallet_db(sample_user_id, ObjectId(), "Simple Wallet")
 
         # Act
         result = await create_wallet(
-            wallet_data=wallet_data, user_id=user_id, db=mock_db
+            wallet_data=wallet_data, user_id=sample_user_id, db=mock_db
         )
 
         # Assert
         assert result["status"] == "success"
         assert result["data"]["description"] is None
 
-    @pytest.mark.asyncio
-    async def test_create_wallet_duplicate_name(self):
+    async def test_create_wallet_duplicate_name(self, mock_db, sample_user_id):
         """Test creating wallet with duplicate name raises 409."""
         # Arrange
-        user_id = ObjectId()
         wallet_data = WalletCreate(name="Duplicate Wallet")
 
-        mock_db = Mock()
         mock_db.wallets.find_one.return_value = {
             "_id": ObjectId(),
-            "user_id": user_id,
+            "user_id": sample_user_id,
             "name": "Duplicate Wallet",
         }
 
         # Act & Assert
         with pytest.raises(HTTPException) as exc_info:
-            await create_wallet(wallet_data=wallet_data, user_id=user_id, db=mock_db)
+            await create_wallet(
+                wallet_data=wallet_data, user_id=sample_user_id, db=mock_db
+            )
 
         assert exc_info.value.status_code == 409
         assert "already exists" in exc_info.value.detail
         mock_db.wallets.insert_one.assert_not_called()
 
-    @pytest.mark.asyncio
-    async def test_create_wallet_database_error(self):
+    async def test_create_wallet_database_error(self, mock_db, sample_user_id):
         """Test wallet creation with database error."""
         # Arrange
-        user_id = ObjectId()
         wallet_data = WalletCreate(name="Error Wallet")
 
-        mock_db = Mock()
         mock_db.wallets.find_one.return_value = None
         mock_db.wallets.insert_one.side_effect = Exception("Database error")
 
         # Act & Assert
         with pytest.raises(HTTPException) as exc_info:
-            await create_wallet(wallet_data=wallet_data, user_id=user_id, db=mock_db)
+            await create_wallet(
+                wallet_data=wallet_data, user_id=sample_user_id, db=mock_db
+            )
 
         assert exc_info.value.status_code == 500
         assert "Error creating wallet" in exc_info.value.detail
 
-    @pytest.mark.asyncio
-    async def test_create_wallet_checks_both_user_id_formats(self):
-        """Test that wallet creation checks for duplicates in both ObjectId and string formats."""
+    async def test_create_wallet_duplicate_check_query(self, sample_user_id):
+        """Test that the duplicate check also matches a legacy string owner."""
         # Arrange
-        user_id = ObjectId()
         wallet_data = WalletCreate(name="Test Wallet")
-
-        wallet_id = ObjectId()
-        mock_db = Mock()
-        mock_db.wallets.insert_one.return_value.inserted_id = wallet_id
-        mock_db.wallets.find_one.side_effect = [
-            None,  # First call: check for existing wallet
-            {  # Second call: get created wallet
-                "_id": wallet_id,
-                "user_id": user_id,
-                "name": "Test Wallet",
-                "description": None,
-            },
-        ]
+        mock_db = make_create_wallet_db(sample_user_id, ObjectId(), "Test Wallet")
 
         # Act
-        await create_wallet(wallet_data=wallet_data, user_id=user_id, db=mock_db)
+        await create_wallet(wallet_data=wallet_data, user_id=sample_user_id, db=mock_db)
 
-        # Assert - verify the query includes both formats
+        # Assert
         call_args = mock_db.wallets.find_one.call_args_list[0][0][0]
-        assert "$or" in call_args
-        assert {"user_id": user_id} in call_args["$or"]
-        assert {"user_id": str(user_id)} in call_args["$or"]
+        assert call_args == {
+            "user_id": {"$in": [sample_user_id, str(sample_user_id)]},
+            "name": "Test Wallet",
+        }
 
 
 class TestDeleteWallet:
     """Unit tests for delete_wallet endpoint."""
 
-    @pytest.mark.asyncio
-    async def test_delete_wallet_success(self):
+    async def test_delete_wallet_success(self, mock_db, sample_user_id):
         """Test successful wallet deletion."""
         # Arrange
-        user_id = ObjectId()
         wallet_id = ObjectId()
 
-        mock_db = Mock()
         mock_db.wallets.find_one.return_value = {
             "_id": wallet_id,
-            "user_id": user_id,
+            "user_id": sample_user_id,
             "name": "Test Wallet",
         }
-        mock_db.transactions.count_documents.return_value = 0
+        mock_db.transactions.delete_many.return_value.deleted_count = 0
         mock_db.wallets.delete_one.return_value = Mock()
 
         # Act
         result = await delete_wallet(
-            wallet_id=str(wallet_id), user_id=user_id, db=mock_db
+            wallet_id=str(wallet_id), user_id=sample_user_id, db=mock_db
         )
 
         # Assert
@@ -300,26 +313,22 @@ class TestDeleteWallet:
         assert result["transactions_deleted"] == 0
         mock_db.wallets.delete_one.assert_called_once_with({"_id": wallet_id})
 
-    @pytest.mark.asyncio
-    async def test_delete_wallet_with_transactions(self):
+    async def test_delete_wallet_with_transactions(self, mock_db, sample_user_id):
         """Test deleting wallet that has transactions."""
         # Arrange
-        user_id = ObjectId()
         wallet_id = ObjectId()
 
-        mock_db = Mock()
         mock_db.wallets.find_one.return_value = {
             "_id": wallet_id,
-            "user_id": user_id,
+            "user_id": sample_user_id,
             "name": "Wallet with Transactions",
         }
-        mock_db.transactions.count_documents.return_value = 5
-        mock_db.transactions.delete_many.return_value = Mock()
+        mock_db.transactions.delete_many.return_value.deleted_count = 5
         mock_db.wallets.delete_one.return_value = Mock()
 
         # Act
         result = await delete_wallet(
-            wallet_id=str(wallet_id), user_id=user_id, db=mock_db
+            wallet_id=str(wallet_id), user_id=sample_user_id, db=mock_db
         )
 
         # Assert
@@ -328,107 +337,203 @@ class TestDeleteWallet:
         mock_db.transactions.delete_many.assert_called_once_with(
             {"wallet_id": wallet_id}
         )
+        mock_db.transactions.count_documents.assert_not_called()
         mock_db.wallets.delete_one.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_delete_wallet_not_found(self):
+    async def test_delete_wallet_not_found(self, mock_db, sample_user_id):
         """Test deleting non-existent wallet."""
         # Arrange
-        user_id = ObjectId()
         wallet_id = ObjectId()
 
-        mock_db = Mock()
         mock_db.wallets.find_one.return_value = None
 
         # Act & Assert
         with pytest.raises(HTTPException) as exc_info:
-            await delete_wallet(wallet_id=str(wallet_id), user_id=user_id, db=mock_db)
+            await delete_wallet(
+                wallet_id=str(wallet_id), user_id=sample_user_id, db=mock_db
+            )
 
         assert exc_info.value.status_code == 404
         assert "not found or not owned by user" in exc_info.value.detail
         mock_db.wallets.delete_one.assert_not_called()
 
-    @pytest.mark.asyncio
-    async def test_delete_wallet_invalid_id_format(self):
+    async def test_delete_wallet_invalid_id_format(self, mock_db, sample_user_id):
         """Test deleting wallet with invalid ObjectId format."""
-        # Arrange
-        user_id = ObjectId()
-        mock_db = Mock()
-
         # Act & Assert
         with pytest.raises(HTTPException) as exc_info:
-            await delete_wallet(wallet_id="invalid-id", user_id=user_id, db=mock_db)
+            await delete_wallet(
+                wallet_id="invalid-id", user_id=sample_user_id, db=mock_db
+            )
 
         assert exc_info.value.status_code == 400
         assert "Invalid wallet ID format" in exc_info.value.detail
         mock_db.wallets.find_one.assert_not_called()
 
-    @pytest.mark.asyncio
-    async def test_delete_wallet_not_owned_by_user(self):
+    async def test_delete_wallet_not_owned_by_user(self, mock_db, sample_user_id):
         """Test deleting wallet owned by another user."""
         # Arrange
-        user_id = ObjectId()
         other_user_id = ObjectId()
         wallet_id = ObjectId()
 
-        mock_db = Mock()
         # Wallet exists but belongs to different user
         mock_db.wallets.find_one.return_value = None
 
         # Act & Assert
         with pytest.raises(HTTPException) as exc_info:
-            await delete_wallet(wallet_id=str(wallet_id), user_id=user_id, db=mock_db)
+            await delete_wallet(
+                wallet_id=str(wallet_id), user_id=sample_user_id, db=mock_db
+            )
 
         assert exc_info.value.status_code == 404
         assert "not found or not owned by user" in exc_info.value.detail
 
-    @pytest.mark.asyncio
-    async def test_delete_wallet_database_error(self):
+    async def test_delete_wallet_database_error(self, mock_db, sample_user_id):
         """Test wallet deletion with database error."""
         # Arrange
-        user_id = ObjectId()
         wallet_id = ObjectId()
 
-        mock_db = Mock()
         mock_db.wallets.find_one.return_value = {
             "_id": wallet_id,
-            "user_id": user_id,
+            "user_id": sample_user_id,
             "name": "Test Wallet",
         }
-        mock_db.transactions.count_documents.side_effect = Exception("Database error")
+        mock_db.transactions.delete_many.side_effect = Exception("Database error")
 
         # Act & Assert
         with pytest.raises(HTTPException) as exc_info:
-            await delete_wallet(wallet_id=str(wallet_id), user_id=user_id, db=mock_db)
+            await delete_wallet(
+                wallet_id=str(wallet_id), user_id=sample_user_id, db=mock_db
+            )
 
         assert exc_info.value.status_code == 500
         assert "Error deleting wallet" in exc_info.value.detail
 
-    @pytest.mark.asyncio
-    async def test_delete_wallet_checks_both_user_id_formats(self):
-        """Test that wallet deletion checks ownership in both ObjectId and string formats."""
+    async def test_delete_wallet_ownership_query(self, mock_db, sample_user_id):
+        """Test that wallet deletion checks ownership by ObjectId user_id."""
         # Arrange
-        user_id = ObjectId()
         wallet_id = ObjectId()
 
-        mock_db = Mock()
         mock_db.wallets.find_one.return_value = {
             "_id": wallet_id,
-            "user_id": user_id,
+            "user_id": sample_user_id,
             "name": "Test Wallet",
         }
-        mock_db.transactions.count_documents.return_value = 0
+        mock_db.transactions.delete_many.return_value.deleted_count = 0
 
         # Act
-        await delete_wallet(wallet_id=str(wallet_id), user_id=user_id, db=mock_db)
+        await delete_wallet(
+            wallet_id=str(wallet_id), user_id=sample_user_id, db=mock_db
+        )
 
-        # Assert - verify the query includes both formats
+        # Assert
         call_args = mock_db.wallets.find_one.call_args[0][0]
-        assert "_id" in call_args
-        assert call_args["_id"] == wallet_id
-        assert "$or" in call_args
-        assert {"user_id": user_id} in call_args["$or"]
-        assert {"user_id": str(user_id)} in call_args["$or"]
+        assert call_args == {"_id": wallet_id, "user_id": sample_user_id}
+
+
+class TestWalletListCache:
+    """Unit tests for the list_wallets result cache."""
+
+    @pytest.fixture(autouse=True)
+    def enable_cache(self, monkeypatch):
+        """Turn the cache on; it is disabled by default."""
+        monkeypatch.setattr("api.cache.Settings.WALLET_LIST_CACHE_TTL", 30)
+
+    async def test_list_wallets_served_from_cache(self, sample_user_id):
+        """Test repeated pages are served from the cache and new pages miss."""
+        # Arrange
+        mock_db = SimpleNamespace(wallets=FakeWallets())
+
+        # Act
+        first = await list_wallets(
+            limit=100, skip=0, user_id=sample_user_id, db=mock_db
+        )
+        second = await list_wallets(
+            limit=100, skip=0, user_id=sample_user_id, db=mock_db
+        )
+        await list_wallets(limit=100, skip=10, user_id=sample_user_id, db=mock_db)
+
+        # Assert
+        assert second is first
+        assert len(mock_db.wallets.pipelines) == 2
+
+    async def test_list_wallets_cache_disabled_with_zero_ttl(
+        self, sample_user_id, monkeypatch
+    ):
+        """Test a zero TTL, the default, disables caching."""
+        monkeypatch.setattr("api.cache.Settings.WALLET_LIST_CACHE_TTL", 0)
+        mock_db = SimpleNamespace(wallets=FakeWallets())
+
+        await list_wallets(limit=100, skip=0, user_id=sample_user_id, db=mock_db)
+        await list_wallets(limit=100, skip=0, user_id=sample_user_id, db=mock_db)
+
+        assert len(mock_db.wallets.pipelines) == 2
+
+    async def test_create_wallet_invalidates_cached_lists(
+        self, sample_user_id, sample_wallet_create
+    ):
+        """Test creating a wallet drops the user's cached pages."""
+        # Arrange
+        set_wallet_list(sample_user_id, 0, 100, {"wallets": [], "count": 0})
+        mock_db = make_create_wallet_db(
+            sample_user_id, ObjectId(), "My Wallet", "Test description"
+        )
+
+        # Act
+        await create_wallet(
+            wallet_data=sample_wallet_create, user_id=sample_user_id, db=mock_db
+        )
+
+        # Assert
+        assert get_wallet_list(sample_user_id, 0, 100) is None
+
+    async def test_delete_wallet_invalidates_cached_lists(
+        self, mock_db, sample_user_id
+    ):
+        """Test deleting a wallet drops the user's cached pages."""
+        # Arrange
+        wallet_id = ObjectId()
+        set_wallet_list(sample_user_id, 0, 100, {"wallets": [], "count": 1})
+        mock_db.wallets.find_one.return_value = {
+            "_id": wallet_id,
+            "user_id": sample_user_id,
+            "name": "Test Wallet",
+        }
+        mock_db.transactions.delete_many.return_value.deleted_count = 0
+
+        # Act
+        await delete_wallet(
+            wallet_id=str(wallet_id), user_id=sample_user_id, db=mock_db
+        )
+
+        # Assert
+        assert get_wallet_list(sample_user_id, 0, 100) is None
+
+    def test_cache_evicts_least_recently_used(self, monkeypatch):
+        """Test the cache stays bounded and keeps recently read pages."""
+        monkeypatch.setattr(api.cache, "MAX_WALLET_LIST_ENTRIES", 2)
+        users = [ObjectId() for _ in range(3)]
+
+        set_wallet_list(users[0], 0, 100, {"count": 0})
+        set_wallet_list(users[1], 0, 100, {"count": 1})
+        get_wallet_list(users[0], 0, 100)
+        set_wallet_list(users[2], 0, 100, {"count": 2})
+
+        assert get_wallet_list(users[0], 0, 100) == {"count": 0}
+        assert get_wallet_list(users[1], 0, 100) is None
+        assert get_wallet_list(users[2], 0, 100) == {"count": 2}
+
+    def test_cache_sweeps_expired_pages_on_set(self, monkeypatch):
+        """Test storing a page drops expired pages that are never read again."""
+        now = [1000.0]
+        monkeypatch.setattr(
+            api.cache, "time", SimpleNamespace(monotonic=lambda: now[0])
+        )
+        set_wallet_list(ObjectId(), 0, 100, {"count": 0})
+
+        now[0] += api.cache.Settings.WALLET_LIST_CACHE_TTL + 1
+        set_wallet_list(ObjectId(), 0, 100, {"count": 1})
+
+        assert len(api.cache._wallet_lists) == 1
 
 
 class TestWalletCreate:
@@ -446,17 +551,16 @@ class TestWalletCreate:
         assert wallet.name == "Test Wallet"
         assert wallet.description is None
 
-    def test_wallet_create_empty_name_fails(self):
-        """Test that empty name fails validation."""
-        with pytest.raises(Exception):  # Pydantic ValidationError
-            WalletCreate(name="")
-
-    def test_wallet_create_name_too_long_fails(self):
-        """Test that name exceeding max length fails validation."""
-        with pytest.raises(Exception):  # Pydantic ValidationError
-            WalletCreate(name="A" * 201)  # Max is 200
-
-    def test_wallet_create_description_too_long_fails(self):
-        """Test that description exceeding max length fails validation."""
-        with pytest.raises(Exception):  # Pydantic ValidationError
-            WalletCreate(name="Test", description="A" * 1001)  # Max is 1000
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"name": ""},
+            {"name": "A" * 201},  # Max is 200
+            {"name": "Test", "description": "A" * 1001},  # Max is 1000
+        ],
+        ids=["empty-name", "name-too-long", "description-too-long"],
+    )
+    def test_wallet_create_rejects_invalid(self, kwargs):
+        """Test that invalid names and descriptions fail validation."""
+        with pytest.raises(ValidationError):
+            WalletCreate(**kwargs)
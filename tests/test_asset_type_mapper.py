@@ -8,26 +8,59 @@ from src.models.mongodb_models import AssetType
 # Mark all tests in this module as unit tests
 pytestmark = pytest.mark.unit
 
+ALL_ASSET_TYPES = list(AssetType)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _patch_genai():
+    """Keep AssetTypeMapper construction off the real GenAI SDK.
+
+    Patched once per module; tests needing a particular response assign
+    ``asset_type_mapper.model`` directly.
+    """
+    with patch("src.services.asset_type_mapper.genai.configure"), patch(
+        "src.services.asset_type_mapper.genai.GenerativeModel"
+    ):
+        yield
+
 
 class TestAssetTypeMapper:
     """Tests for AssetTypeMapper."""
 
+    @pytest.fixture(scope="module")
+    def _shared_genai_model(self):
+        """Single GenAI model mock reused across the module."""
+        return Mock()
+
     @pytest.fixture
-    def mock_genai_model(self):
-        """Mock GenAI model for testing."""
-        mock_model = Mock()
-        mock_response = Mock()
-        mock_response.text = '{"asset_type": "stock", "symbol": "AAPL"}'
-        mock_model.generate_content.return_value = mock_response
+    def mock_genai_model(self, _shared_genai_model):
+        """Mock GenAI model for testing, reset to the default AAPL response."""
+        mock_model = _shared_genai_model
+        mock_model.reset_mock()
+        mock_model.generate_content.side_effect = None
+        mock_model.generate_content.return_value.text = (
+            '{"asset_type": "stock", "symbol": "AAPL"}'
+        )
         return mock_model
 
-    @pytest.fixture
-    def asset_type_mapper(self, set_test_env_vars):
-        """Create AssetTypeMapper instance for testing."""
+    @pytest.fixture(scope="module")
+    def asset_type_mapper(self):
+        """Create one AssetTypeMapper instance shared by the module.
+
+        Settings is only read in ``__init__``, so it is patched just for the
+        construction and restored before any test runs; tests that need a
+        specific response assign ``.model``.
+        """
         with patch("src.services.asset_type_mapper.Settings") as mock_settings:
             mock_settings.GOOGLE_API_KEY = "test_api_key_12345"
             mock_settings.GENAI_MODEL = "gemini-1.5-flash"
-            yield AssetTypeMapper()
+            mapper = AssetTypeMapper()
+        return mapper
+
+    @pytest.fixture(autouse=True)
+    def _clear_inference_cache(self, asset_type_mapper):
+        """Keep cached inferences from leaking between tests."""
+        asset_type_mapper.clear_cache()
 
     def test_init_with_api_key(self):
         """Test AssetTypeMapper initialization with API key."""
@@ -54,63 +87,93 @@ class TestAssetTypeMapper:
         with pytest.raises(ValueError, match="Google API key is required"):
             AssetTypeMapper()
 
-    @patch("src.services.asset_type_mapper.genai.configure")
-    @patch("src.services.asset_type_mapper.genai.GenerativeModel")
-    def test_infer_asset_info_success(
+    @pytest.mark.parametrize(
+        "asset_name,response_text,expected",
+        [
+            pytest.param(
+                "Apple Inc.",
+                '{"asset_type": "stock", "symbol": "AAPL"}',
+                {"asset_type": "stock", "symbol": "AAPL"},
+                id="success",
+            ),
+            pytest.param(
+                "Bitcoin",
+                '{"asset_type": "cryptocurrency", "symbol": "BTC"}',
+                {"asset_type": "cryptocurrency", "symbol": "BTC"},
+                id="cryptocurrency",
+            ),
+            pytest.param(
+                "US Treasury Bond",
+                '{"asset_type": "bond", "symbol": ""}',
+                {"asset_type": "bond", "symbol": ""},
+                id="without-symbol",
+            ),
+            pytest.param(
+                "Test Asset", "Invalid JSON response", None, id="invalid-json"
+            ),
+            pytest.param(
+                "Test Asset",
+                '{"asset_type": "invalid_type", "symbol": "TEST"}',
+                None,
+                id="invalid-asset-type",
+            ),
+            # Missing symbol field should default to an empty symbol
+            pytest.param(
+                "Test Asset",
+                '{"asset_type": "stock"}',
+                {"asset_type": "stock", "symbol": ""},
+                id="malformed-response",
+            ),
+            pytest.param(
+                "Test Asset",
+                '{"asset_type": "stock", "symbol": "%s"}' % ("A" * 25),
+                None,
+                id="long-symbol-rejected",
+            ),
+        ],
+    )
+    def test_infer_asset_info(
         self,
-        mock_genai_model_class,
-        mock_configure,
         asset_type_mapper,
         mock_genai_model,
+        asset_name,
+        response_text,
+        expected,
     ):
-        """Test successful asset type inference."""
-        mock_genai_model_class.return_value = mock_genai_model
+        """Test asset type inference for accepted and rejected responses."""
+        mock_genai_model.generate_content.return_value.text = response_text
         asset_type_mapper.model = mock_genai_model
 
-        result = asset_type_mapper.infer_asset_info("Apple Inc.")
+        result = asset_type_mapper.infer_asset_info(asset_name)
 
-        assert result == {"asset_type": "stock", "symbol": "AAPL"}
+        assert result == expected
         mock_genai_model.generate_content.assert_called_once()
 
-    @patch("src.services.asset_type_mapper.genai.configure")
-    @patch("src.services.asset_type_mapper.genai.GenerativeModel")
-    def test_infer_asset_info_cryptocurrency(
-        self,
-        mock_genai_model_class,
-        mock_configure,
-        asset_type_mapper,
-        mock_genai_model,
-    ):
-        """Test cryptocurrency asset type inference."""
-        mock_response = Mock()
-        mock_response.text = '{"asset_type": "cryptocurrency", "symbol": "BTC"}'
-        mock_genai_model.generate_content.return_value = mock_response
-        mock_genai_model_class.return_value = mock_genai_model
+    def test_infer_asset_info_cached(self, asset_type_mapper, mock_genai_model):
+        """Test repeated asset names are answered from the cache."""
         asset_type_mapper.model = mock_genai_model
 
-        result = asset_type_mapper.infer_asset_info("Bitcoin")
+        first = asset_type_mapper.infer_asset_info("Apple Inc.")
+        second = asset_type_mapper.infer_asset_info("  apple inc. ")
 
-        assert result == {"asset_type": "cryptocurrency", "symbol": "BTC"}
+        assert first == second == {"asset_type": "stock", "symbol": "AAPL"}
+        assert mock_genai_model.generate_content.call_count == 1
 
-    @patch("src.services.asset_type_mapper.genai.configure")
-    @patch("src.services.asset_type_mapper.genai.GenerativeModel")
-    def test_infer_asset_info_without_symbol(
-        self,
-        mock_genai_model_class,
-        mock_configure,
-        asset_type_mapper,
-        mock_genai_model,
+    def test_infer_asset_info_failure_not_cached(
+        self, asset_type_mapper, mock_genai_model
     ):
-        """Test asset type inference without symbol."""
-        mock_response = Mock()
-        mock_response.text = '{"asset_type": "bond", "symbol": ""}'
-        mock_genai_model.generate_content.return_value = mock_response
-        mock_genai_model_class.return_value = mock_genai_model
+        """Test failed inferences are retried on the next call."""
+        mock_genai_model.generate_content.side_effect = [
+            Exception("API Error"),
+            mock_genai_model.generate_content.return_value,
+        ]
         asset_type_mapper.model = mock_genai_model
 
-        result = asset_type_mapper.infer_asset_info("US Treasury Bond")
-
-        assert result == {"asset_type": "bond", "symbol": ""}
+        assert asset_type_mapper.infer_asset_info("Apple Inc.") is None
+        assert asset_type_mapper.infer_asset_info("Apple Inc.") == {
+            "asset_type": "stock",
+            "symbol": "AAPL",
+        }
 
     def test_infer_asset_info_empty_name(self, asset_type_mapper):
         """Test inference with empty asset name returns None."""
@@ -120,102 +183,9 @@ class TestAssetTypeMapper:
         result = asset_type_mapper.infer_asset_info(None)
         assert result is None
 
-    @patch("src.services.asset_type_mapper.genai.configure")
-    @patch("src.services.asset_type_mapper.genai.GenerativeModel")
-    def test_infer_asset_info_api_failure(
-        self,
-        mock_genai_model_class,
-        mock_configure,
-        asset_type_mapper,
-        mock_genai_model,
-    ):
+    def test_infer_asset_info_api_failure(self, asset_type_mapper, mock_genai_model):
         """Test asset type inference handles API failure gracefully."""
         mock_genai_model.generate_content.side_effect = Exception("API Error")
-        mock_genai_model_class.return_value = mock_genai_model
-        asset_type_mapper.model = mock_genai_model
-
-        result = asset_type_mapper.infer_asset_info("Test Asset")
-
-        assert result is None
-
-    @patch("src.services.asset_type_mapper.genai.configure")
-    @patch("src.services.asset_type_mapper.genai.GenerativeModel")
-    def test_infer_asset_info_invalid_json(
-        self,
-        mock_genai_model_class,
-        mock_configure,
-        asset_type_mapper,
-        mock_genai_model,
-    ):
-        """Test asset type inference handles invalid JSON response."""
-        mock_response = Mock()
-        mock_response.text = "Invalid JSON response"
-        mock_genai_model.generate_content.return_value = mock_response
-        mock_genai_model_class.return_value = mock_genai_model
-        asset_type_mapper.model = mock_genai_model
-
-        result = asset_type_mapper.infer_asset_info("Test Asset")
-
-        assert result is None
-
-    @patch("src.services.asset_type_mapper.genai.configure")
-    @patch("src.services.asset_type_mapper.genai.GenerativeModel")
-    def test_infer_asset_info_invalid_asset_type(
-        self,
-        mock_genai_model_class,
-        mock_configure,
-        asset_type_mapper,
-        mock_genai_model,
-    ):
-        """Test asset type inference handles invalid asset type."""
-        mock_response = Mock()
-        mock_response.text = '{"asset_type": "invalid_type", "symbol": "TEST"}'
-        mock_genai_model.generate_content.return_value = mock_response
-        mock_genai_model_class.return_value = mock_genai_model
-        asset_type_mapper.model = mock_genai_model
-
-        result = asset_type_mapper.infer_asset_info("Test Asset")
-
-        assert result is None
-
-    @patch("src.services.asset_type_mapper.genai.configure")
-    @patch("src.services.asset_type_mapper.genai.GenerativeModel")
-    def test_infer_asset_info_malformed_response(
-        self,
-        mock_genai_model_class,
-        mock_configure,
-        asset_type_mapper,
-        mock_genai_model,
-    ):
-        """Test asset type inference handles malformed response."""
-        mock_response = Mock()
-        mock_response.text = '{"asset_type": "stock"}'  # Missing symbol field
-        mock_genai_model.generate_content.return_value = mock_response
-        mock_genai_model_class.return_value = mock_genai_model
-        asset_type_mapper.model = mock_genai_model
-
-        result = asset_type_mapper.infer_asset_info("Test Asset")
-
-        assert result == {
-            "asset_type": "stock",
-            "symbol": "",
-        }  # Should default empty symbol
-
-    @patch("src.services.asset_type_mapper.genai.configure")
-    @patch("src.services.asset_type_mapper.genai.GenerativeModel")
-    def test_infer_asset_info_long_symbol_rejected(
-        self,
-        mock_genai_model_class,
-        mock_configure,
-        asset_type_mapper,
-        mock_genai_model,
-    ):
-        """Test asset type inference rejects overly long symbols."""
-        mock_response = Mock()
-        long_symbol = "A" * 25  # Too long
-        mock_response.text = f'{{"asset_type": "stock", "symbol": "{long_symbol}"}}'
-        mock_genai_model.generate_content.return_value = mock_response
-        mock_genai_model_class.return_value = mock_genai_model
         asset_type_mapper.model = mock_genai_model
 
         result = asset_type_mapper.infer_asset_info("Test Asset")
@@ -234,6 +204,13 @@ class TestAssetTypeMapper:
         assert "cryptocurrency" in prompt
         assert "bond" in prompt
 
+    def test_build_asset_classification_prompt_memoized(self, asset_type_mapper):
+        """Test repeated asset names reuse the cached prompt."""
+        first = asset_type_mapper._build_asset_classification_prompt("Apple Inc.")
+        second = asset_type_mapper._build_asset_classification_prompt("Apple Inc.")
+
+        assert first is second
+
     def test_parse_asset_response_valid(self, asset_type_mapper):
         """Test parsing valid asset response."""
         response_text = '{"asset_type": "stock", "symbol": "AAPL"}'
@@ -248,6 +225,23 @@ class TestAssetTypeMapper:
 
         assert result == {"asset_type": "stock", "symbol": "AAPL"}
 
+    @pytest.mark.parametrize(
+        "response_text",
+        [
+            "Sure! " * 5000 + '{"asset_type": "stock", "symbol": "AAPL"}',
+            '```json\n{"asset_type": "stock", "symbol": "AAPL"}\n```',
+            '{"note": "x"} then {"asset_type": "stock", "symbol": "AAPL"} {"x": 1}',
+        ],
+        ids=["long-preamble", "code-fence", "surrounding-objects"],
+    )
+    def test_parse_asset_response_finds_embedded_json(
+        self, asset_type_mapper, response_text
+    ):
+        """Test the asset JSON object is extracted from surrounding text."""
+        result = asset_type_mapper._parse_asset_response(response_text)
+
+        assert result == {"asset_type": "stock", "symbol": "AAPL"}
+
     def test_parse_asset_response_invalid_json(self, asset_type_mapper):
         """Test parsing invalid JSON response."""
         response_text = "Not valid JSON"
@@ -286,11 +280,11 @@ class TestAssetTypeMapper:
         """Test validation of empty dict result."""
         assert asset_type_mapper._validate_asset_result({}) is False
 
-    def test_all_valid_asset_types_recognized(self, asset_type_mapper):
-        """Test that all valid asset types are recognized."""
-        for asset_type in AssetType:
-            valid_result = {"asset_type": asset_type.value, "symbol": "TEST"}
-            assert asset_type_mapper._validate_asset_result(valid_result) is True
+    @pytest.mark.parametrize("asset_type", ALL_ASSET_TYPES, ids=lambda t: t.value)
+    def test_all_valid_asset_types_recognized(self, asset_type_mapper, asset_type):
+        """Test that every AssetType value is recognized."""
+        valid_result = {"asset_type": asset_type.value, "symbol": "TEST"}
+        assert asset_type_mapper._validate_asset_result(valid_result) is True
 
     @pytest.mark.gemini_api
     def test_determine_asset_type_with_real_api(self, set_test_env_vars):
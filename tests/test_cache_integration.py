@@ -5,63 +5,62 @@ from pathlib import Path
 from unittest.mock import MagicMock, patch
 from bson import ObjectId
 
+from pydantic import TypeAdapter
+
 from src.pipeline import DataPipeline
-from src.config.mongodb import MongoDBConfig
+from src.models.mongodb_models import Wallet
 
 # Mark all tests in this module as integration tests
 pytestmark = pytest.mark.integration
 
+# Dumps every test wallet in one serializer call
+_WALLETS_ADAPTER = TypeAdapter(list[Wallet])
+
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def test_user_id():
     """Test user ID."""
     return ObjectId("507f1f77bcf86cd799439011")
 
 
-@pytest.fixture
-def test_db(test_user_id):
-    """Get test database and clean up."""
-    db = MongoDBConfig.get_database()
+def _delete_test_user_data(db, user_id):
+    """Remove the test user's wallets plus their transactions and assets."""
+    wallet_ids = db.wallets.distinct("_id", {"user_id": user_id})
+    if wallet_ids:
+        wallet_filter = {"wallet_id": {"$in": wallet_ids}}
+        asset_ids = db.transactions.distinct("asset_id", wallet_filter)
+        if asset_ids:
+            db.assets.delete_many({"_id": {"$in": asset_ids}})
+        db.transactions.delete_many(wallet_filter)
+        db.wallets.delete_many({"_id": {"$in": wallet_ids}})
+
 
-    # Clean up before test
+@pytest.fixture(scope="module")
+def test_db(mapping_cache_db, test_user_id):
+    """
+    Get test database, cleaned once for the module.
+
+    Only the test user's cache entries, wallets, transactions and assets are
+    removed, so other users' data survives under --real-mongo.
+    """
+    db = mapping_cache_db
     db.column_mapping_cache.delete_many({"user_id": test_user_id})
-    db.wallets.delete_many({"user_id": test_user_id})
-    # Only delete assets that are referenced by test transactions
-    test_wallet_ids = [w["_id"] for w in db.wallets.find({"user_id": test_user_id})]
-    if test_wallet_ids:
-        test_asset_ids = [
-            t["asset_id"]
-            for t in db.transactions.find({"wallet_id": {"$in": test_wallet_ids}})
-        ]
-        if test_asset_ids:
-            db.assets.delete_many({"_id": {"$in": test_asset_ids}})
-    db.transactions.delete_many({"user_id": test_user_id})
+    _delete_test_user_data(db, test_user_id)
 
     yield db
 
-    # Clean up after test
     db.column_mapping_cache.delete_many({"user_id": test_user_id})
-    db.wallets.delete_many({"user_id": test_user_id})
-    # Only delete assets that are referenced by test transactions
-    test_wallet_ids = [w["_id"] for w in db.wallets.find({"user_id": test_user_id})]
-    if test_wallet_ids:
-        test_asset_ids = [
-            t["asset_id"]
-            for t in db.transactions.find({"wallet_id": {"$in": test_wallet_ids}})
-        ]
-        if test_asset_ids:
-            db.assets.delete_many({"_id": {"$in": test_asset_ids}})
-    db.transactions.delete_many({"user_id": test_user_id})
-
-
-@pytest.fixture
-def sample_csv_file(tmp_path):
-    """Create a sample CSV file."""
+    _delete_test_user_data(db, test_user_id)
+
+
+@pytest.fixture(scope="module")
+def sample_csv_file(tmp_path_factory):
+    """Create a sample CSV file once for the module; uploads only read it."""
     csv_content = """Date,Asset,Price,Quantity,Total,Fee,Currency
 2024-01-10,AAPL,150.50,10,1505.00,5.00,USD
 2024-01-11,GOOGL,140.00,5,700.00,3.00,USD
 """
-    filepath = tmp_path / "test_transactions.csv"
+    filepath = tmp_path_factory.mktemp("cache_integration") / "test_transactions.csv"
     filepath.write_text(csv_content)
     return filepath
 
@@ -74,17 +73,14 @@ def test_cache_reduces_ai_calls(
     # Since the autouse fixture already mocks AI calls, we just need to test the cache functionality
 
     # Create wallets for testing
-    from src.models.mongodb_models import Wallet
-
-    wallet1 = Wallet(user_id=test_user_id, name="Test Wallet 1", description="Test")
-    wallet1_dict = wallet1.model_dump(by_alias=True, exclude={"id"}, mode="python")
-    result1 = test_db.wallets.insert_one(wallet1_dict)
-    wallet1_id = result1.inserted_id
-
-    wallet2 = Wallet(user_id=test_user_id, name="Test Wallet 2", description="Test")
-    wallet2_dict = wallet2.model_dump(by_alias=True, exclude={"id"}, mode="python")
-    result2 = test_db.wallets.insert_one(wallet2_dict)
-    wallet2_id = result2.inserted_id
+    wallets = [
+        Wallet(user_id=test_user_id, name="Test Wallet 1", description="Test"),
+        Wallet(user_id=test_user_id, name="Test Wallet 2", description="Test"),
+    ]
+    wallet_docs = _WALLETS_ADAPTER.dump_python(
+        wallets, by_alias=True, exclude={"__all__": {"id"}}
+    )
+    wallet1_id, wallet2_id = test_db.wallets.insert_many(wallet_docs).inserted_ids
 
     # First upload - should call AI
     pipeline1 = DataPipeline(db=test_db, user_id=test_user_id, api_key="test_key")
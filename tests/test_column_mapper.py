@@ -119,6 +119,19 @@ class TestColumnMapper:
         assert mapping["wallet_name"] == "account"
         assert mapping["asset_name"] == "stock"
 
+    @patch("src.services.column_mapper.genai")
+    def test_parse_mapping_response_with_surrounding_text(
+        self, mock_genai, set_test_env_vars
+    ):
+        """Test parsing a fenced response preceded and followed by prose."""
+        mapper = ColumnMapper(api_key="test_key")
+
+        response = 'Here is the mapping:\n```JSON\n{"asset_name": "stock"}\n```\nDone.'
+
+        mapping = mapper._parse_mapping_response(response)
+
+        assert mapping == {"asset_name": "stock"}
+
     def test_validate_mapping_missing_target_columns(self, set_test_env_vars):
         """Test validation catches missing target columns."""
         mapper = ColumnMapper(api_key="test_key")
@@ -184,6 +197,19 @@ class TestColumnMapper:
 
         assert result_df.iloc[0]["currency"] == "USD"
 
+    def test_apply_mapping_without_mapped_sources(self, set_test_env_vars):
+        """Test unmapped-only mappings keep one row per source row."""
+        mapper = ColumnMapper(api_key="test_key")
+
+        source_df = pd.DataFrame({"stock": ["AAPL", "MSFT"]})
+        mapping = {"currency": None, "fee": None}
+
+        result_df = mapper.apply_mapping(source_df, mapping, {"currency": "USD"})
+
+        assert len(result_df) == 2
+        assert result_df["currency"].tolist() == ["USD", "USD"]
+        assert result_df["fee"].tolist() == [None, None]
+
     def test_build_mapping_prompt(self, set_test_env_vars):
         """Test that prompt is built correctly."""
         mapper = ColumnMapper(api_key="test_key")
@@ -200,6 +226,23 @@ class TestColumnMapper:
         assert "asset_price" in prompt
         assert "JSON" in prompt
 
+    def test_build_mapping_prompt_serializes_data_as_indented_json(
+        self, set_test_env_vars
+    ):
+        """Test prompt data is 2-space indented stdlib JSON, ASCII-escaped."""
+        mapper = ColumnMapper(api_key="test_key")
+
+        prompt = mapper._build_mapping_prompt(
+            ["Währung"], ("currency",), [{"Währung": "€", "Preis": 1.5}]
+        )
+
+        assert '[\n  "currency"\n]' in prompt
+        assert '[\n  "W\\u00e4hrung"\n]' in prompt
+        assert (
+            '[\n  {\n    "W\\u00e4hrung": "\\u20ac",\n    "Preis": 1.5\n  }\n]'
+            in prompt
+        )
+
     @pytest.mark.gemini_api
     def test_map_columns_with_real_api(self, set_test_env_vars):
         """
@@ -6,35 +6,44 @@ from bson import ObjectId
 from datetime import datetime
 
 from src.services.column_mapper import ColumnMapper
-from src.config.mongodb import MongoDBConfig
 
 # Mark all tests in this module as integration tests
 pytestmark = pytest.mark.integration
 
 
-@pytest.fixture
+TEST_USER_ID = ObjectId("507f1f77bcf86cd799439011")
+# Second and third owners for the per-user isolation test
+OTHER_USER_IDS = (
+    ObjectId("507f1f77bcf86cd799439021"),
+    ObjectId("507f1f77bcf86cd799439022"),
+)
+_TEST_USERS_FILTER = {"user_id": {"$in": [TEST_USER_ID, *OTHER_USER_IDS]}}
+
+
+@pytest.fixture(scope="module")
 def test_user_id():
     """Test user ID."""
-    return ObjectId("507f1f77bcf86cd799439011")
+    return TEST_USER_ID
 
 
-@pytest.fixture
-def test_db(test_user_id):
-    """Get test database and clean up cache collection."""
-    db = MongoDBConfig.get_database()
+@pytest.fixture(scope="module")
+def _module_db(mapping_cache_db):
+    """Cache database; the test users' entries are removed after the module."""
+    yield mapping_cache_db
 
-    # Clean up before test
-    db.column_mapping_cache.delete_many({"user_id": test_user_id})
+    mapping_cache_db.column_mapping_cache.delete_many(_TEST_USERS_FILTER)
 
-    yield db
 
-    # Clean up after test
-    db.column_mapping_cache.delete_many({"user_id": test_user_id})
+@pytest.fixture
+def test_db(_module_db):
+    """Get test database with the test users' cache entries cleared."""
+    _module_db.column_mapping_cache.delete_many(_TEST_USERS_FILTER)
+    return _module_db
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_dataframe():
-    """Sample DataFrame for testing."""
+    """Sample DataFrame for testing, shared by the module (tests only read it)."""
     return pd.DataFrame(
         {
             "Account": ["Wallet1", "Wallet2"],
@@ -77,6 +86,17 @@ class TestColumnMappingCache:
 
         assert key1 != key2
 
+    def test_cache_key_no_delimiter_collision(self, test_db, test_user_id):
+        """Test that column names containing separators don't collide."""
+        mapper = ColumnMapper(db=test_db, user_id=test_user_id)
+
+        df1 = pd.DataFrame(columns=["a|b", "c"])
+        df2 = pd.DataFrame(columns=["a", "b|c"])
+
+        assert mapper._generate_cache_key(df1, "csv") != mapper._generate_cache_key(
+            df2, "csv"
+        )
+
     def test_cache_storage_and_retrieval(self, test_db, test_user_id, sample_dataframe):
         """Test storing and retrieving mappings from cache."""
         mapper = ColumnMapper(db=test_db, user_id=test_user_id)
@@ -130,10 +150,32 @@ class TestColumnMappingCache:
 
         assert cache_entry["hit_count"] == 3
 
+    def test_cache_restore_keeps_hit_count(
+        self, test_db, test_user_id, sample_dataframe
+    ):
+        """Test that storing an existing entry updates the mapping only."""
+        mapper = ColumnMapper(db=test_db, user_id=test_user_id)
+        cache_key = mapper._generate_cache_key(sample_dataframe, "csv")
+
+        mapper._store_mapping_cache(
+            cache_key, sample_dataframe, "csv", {"asset_name": "Stock Name"}
+        )
+        mapper._get_cached_mapping(cache_key)
+        mapper._store_mapping_cache(
+            cache_key, sample_dataframe, "csv", {"asset_name": "Asset"}
+        )
+
+        cache_entry = test_db.column_mapping_cache.find_one(
+            {"user_id": test_user_id, "cache_key": cache_key}
+        )
+
+        assert cache_entry["mapping"] == {"asset_name": "Asset"}
+        assert cache_entry["hit_count"] == 1
+        assert cache_entry["version"] == mapper.cache_version
+
     def test_cache_per_user_isolation(self, test_db, sample_dataframe):
         """Test that cache is isolated per user."""
-        user1_id = ObjectId()
-        user2_id = ObjectId()
+        user1_id, user2_id = OTHER_USER_IDS
 
         mapper1 = ColumnMapper(db=test_db, user_id=user1_id)
         mapper2 = ColumnMapper(db=test_db, user_id=user2_id)
@@ -155,11 +197,6 @@ class TestColumnMappingCache:
         assert retrieved2 == mapping2
         assert retrieved1 != retrieved2
 
-        # Clean up
-        test_db.column_mapping_cache.delete_many(
-            {"user_id": {"$in": [user1_id, user2_id]}}
-        )
-
     def test_cache_version_isolation(self, test_db, test_user_id, sample_dataframe):
         """Test that different cache versions are isolated."""
         mapper = ColumnMapper(db=test_db, user_id=test_user_id)
@@ -8,22 +8,49 @@ from src.config.settings import Settings
 pytestmark = pytest.mark.unit
 
 
+@pytest.fixture
+def reload_settings(monkeypatch):
+    """
+    Return a function that reloads the settings module from the environment.
+
+    Modules that imported Settings keep the original class, so the module
+    attribute is restored to it after the test.
+    """
+    from importlib import reload
+    from src.config import settings
+
+    monkeypatch.setattr(settings, "Settings", settings.Settings)
+
+    def _reload():
+        return reload(settings)
+
+    return _reload
+
+
 class TestSettings:
     """Tests for Settings class."""
 
-    def test_settings_with_env_vars(self, monkeypatch):
+    def test_settings_with_env_vars(self, reload_settings, monkeypatch):
         """Test that settings load from environment variables."""
         monkeypatch.setenv("GOOGLE_API_KEY", "test_api_key")
         monkeypatch.setenv("GENAI_MODEL", "test-model")
+        monkeypatch.setenv("WALLET_LIST_CACHE_TTL", "5")
 
-        # Reload Settings to pick up new env vars
-        from importlib import reload
-        from src.config import settings
-
-        reload(settings)
+        settings = reload_settings()
 
         assert settings.Settings.GOOGLE_API_KEY == "test_api_key"
         assert settings.Settings.GENAI_MODEL == "test-model"
+        assert settings.Settings.WALLET_LIST_CACHE_TTL == 5.0
+
+    def test_malformed_cache_ttl_falls_back_to_default(
+        self, reload_settings, monkeypatch
+    ):
+        """Test that an invalid WALLET_LIST_CACHE_TTL doesn't break the import."""
+        monkeypatch.setenv("WALLET_LIST_CACHE_TTL", "thirty")
+
+        settings = reload_settings()
+
+        assert settings.Settings.WALLET_LIST_CACHE_TTL == 0.0
 
     def test_settings_defaults(self, monkeypatch):
         """Test default settings values."""
@@ -34,15 +61,12 @@ class TestSettings:
 
     def test_validate_missing_api_key(self, monkeypatch):
         """Test validation fails when API key is missing."""
-        monkeypatch.setenv("GOOGLE_API_KEY", "")
-
-        from importlib import reload
-        from src.config import settings
-
-        reload(settings)
+        # validate() reads the class attribute, so patch it instead of
+        # reloading the module (monkeypatch restores it afterwards)
+        monkeypatch.setattr(Settings, "GOOGLE_API_KEY", "")
 
         with pytest.raises(ValueError, match="GOOGLE_API_KEY must be set"):
-            settings.Settings.validate()
+            Settings.validate()
 
     def test_target_columns_defined(self):
         """Test that target columns are properly defined."""
@@ -1,14 +1,35 @@
 """Tests for data models."""
 
+import copy
+import io
+import re
+import uuid
 import pytest
 from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import Mock
 import pandas as pd
 
+from src.models import data_model
 from src.models.data_model import TransactionRecord, FinancialDataModel
 
 # Mark all tests in this module as unit tests
 pytestmark = pytest.mark.unit
 
+# Error patterns compiled once for pytest.raises(match=...)
+_NON_NEGATIVE_RE = re.compile("must be non-negative")
+_BAD_DATE_RE = re.compile("Unable to parse date")
+
+# Minimal record fields without date or fee
+_BASE_RECORD = {
+    "asset_name": "Test",
+    "asset_price": 100.0,
+    "volume": 1,
+    "transaction_amount": 100.0,
+    "currency": "USD",
+    "transaction_type": "buy",
+}
+
 
 class TestTransactionRecord:
     """Tests for TransactionRecord model."""
@@ -25,174 +46,234 @@ class TestTransactionRecord:
         assert record.fee == 5.0
         assert record.currency == "USD"
 
-    def test_date_parsing_multiple_formats(self):
+    @pytest.mark.parametrize(
+        "date_str",
+        ["2024-01-10", "10/01/2024", "01/10/2024"],
+        ids=["YYYY-MM-DD", "DD/MM/YYYY", "MM/DD/YYYY"],
+    )
+    def test_date_parsing_multiple_formats(self, date_str):
         """Test that various date formats are parsed correctly."""
-        date_formats = [
-            ("2024-01-10", "YYYY-MM-DD"),
-            ("10/01/2024", "DD/MM/YYYY"),
-            ("01/10/2024", "MM/DD/YYYY"),
-        ]
-
-        for date_str, _ in date_formats:
-            data = {
-                "asset_name": "Test",
-                "date": date_str,
-                "asset_price": 100.0,
-                "volume": 1,
-                "transaction_amount": 100.0,
-                "currency": "USD",
-                "transaction_type": "buy",
-            }
-            record = TransactionRecord(**data)
-            assert isinstance(record.date, datetime)
-
-    def test_negative_price_raises_error(self, valid_financial_record_data):
-        """Test that negative prices are rejected."""
-        valid_financial_record_data["asset_price"] = -100.0
-
-        with pytest.raises(ValueError, match="must be non-negative"):
-            TransactionRecord(**valid_financial_record_data)
-
-    def test_negative_volume_raises_error(self, valid_financial_record_data):
-        """Test that negative volume values are rejected."""
-        valid_financial_record_data["volume"] = -5
-
-        with pytest.raises(ValueError, match="must be non-negative"):
-            TransactionRecord(**valid_financial_record_data)
-
-    def test_negative_transaction_amount_raises_error(
-        self, valid_financial_record_data
+        record = TransactionRecord(**_BASE_RECORD, date=date_str)
+
+        assert isinstance(record.date, datetime)
+
+    @pytest.mark.parametrize(
+        "field,value",
+        [("asset_price", -100.0), ("volume", -5), ("transaction_amount", -1000.0)],
+    )
+    def test_negative_values_raise_error(
+        self, valid_financial_record_data, field, value
     ):
-        """Test that negative transaction amount is rejected."""
-        valid_financial_record_data["transaction_amount"] = -1000.0
+        """Test that negative price, volume and transaction amount are rejected."""
+        data = {**valid_financial_record_data, field: value}
 
-        with pytest.raises(ValueError, match="must be non-negative"):
-            TransactionRecord(**valid_financial_record_data)
+        with pytest.raises(ValueError, match=_NON_NEGATIVE_RE):
+            TransactionRecord(**data)
 
     def test_invalid_date_raises_error(self, valid_financial_record_data):
         """Test that invalid date format raises error."""
-        valid_financial_record_data["date"] = "not-a-date"
+        data = {**valid_financial_record_data, "date": "not-a-date"}
 
-        with pytest.raises(ValueError, match="Unable to parse date"):
-            TransactionRecord(**valid_financial_record_data)
+        with pytest.raises(ValueError, match=_BAD_DATE_RE):
+            TransactionRecord(**data)
 
     def test_default_fee_is_zero(self):
         """Test that fee defaults to 0.0 when not provided."""
-        data = {
-            "asset_name": "Test",
-            "date": "2024-01-10",
-            "asset_price": 100.0,
-            "volume": 1,
-            "transaction_amount": 100.0,
-            "currency": "USD",
-            "transaction_type": "buy",
-        }
-        record = TransactionRecord(**data)
+        record = TransactionRecord(**_BASE_RECORD, date="2024-01-10")
 
         assert record.fee == 0.0
 
 
+@pytest.fixture(scope="module")
+def _empty_model_template():
+    """Empty FinancialDataModel built once per module."""
+    return FinancialDataModel()
+
+
+@pytest.fixture
+def empty_model(_empty_model_template):
+    """
+    Fresh empty FinancialDataModel copied from the module template.
+
+    The model only ever rebinds ``df``, so a shallow copy keeps tests isolated.
+    """
+    model = copy.copy(_empty_model_template)
+    model.df = _empty_model_template.df.copy(deep=False)
+    return model
+
+
+@pytest.fixture(scope="module")
+def valid_record(valid_financial_record_data):
+    """TransactionRecord validated once per module; tests must not mutate it."""
+    return TransactionRecord(**valid_financial_record_data)
+
+
+@pytest.fixture(scope="module")
+def valid_records(valid_record, valid_financial_record_data):
+    """Two validated records (AAPL, BTC) shared by the module."""
+    return [
+        valid_record,
+        TransactionRecord(**{**valid_financial_record_data, "asset_name": "BTC"}),
+    ]
+
+
+@pytest.fixture(scope="module")
+def loaded_model(sample_dataframe):
+    """Model loaded from sample_dataframe once per module; read-only."""
+    model = FinancialDataModel()
+    model.load_from_dataframe(sample_dataframe)
+    return model
+
+
+@pytest.fixture(scope="module")
+def invalid_rows_df():
+    """DataFrame whose second row is invalid, built once per module."""
+    return pd.DataFrame(
+        {
+            "asset_name": ["AAPL", "BTC"],
+            "date": ["2024-01-10", "2024-01-11"],
+            "asset_price": [150.50, -100.0],  # negative price
+            "volume": [10.0, 0.5],
+            "transaction_amount": [1505.00, -50.00],  # negative amount
+            "fee": [5.0, 10.0],
+            "currency": ["USD", "USD"],
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def csv_dir(tmp_path_factory):
+    """Output directory shared by the module's CSV export tests."""
+    return tmp_path_factory.mktemp("csv_out")
+
+
 class TestFinancialDataModel:
     """Tests for FinancialDataModel."""
 
-    def test_initialize_empty_model(self):
+    def test_initialize_empty_model(self, empty_model):
         """Test initializing an empty data model."""
-        model = FinancialDataModel()
+        assert len(empty_model.df) == 0
+        assert list(empty_model.df.columns) == list(empty_model.columns)
 
-        assert len(model.df) == 0
-        assert list(model.df.columns) == model.columns
-
-    def test_add_single_record(self, valid_financial_record_data):
+    def test_add_single_record(self, empty_model, valid_record):
         """Test adding a single record."""
-        model = FinancialDataModel()
-        record = TransactionRecord(**valid_financial_record_data)
+        empty_model.add_records([valid_record])
 
-        model.add_record(record)
+        assert len(empty_model.df) == 1
+        assert empty_model.df.iloc[0]["asset_name"] == "AAPL"
 
-        assert len(model.df) == 1
-        assert model.df.iloc[0]["asset_name"] == "AAPL"
+    def test_add_record_appends(self, empty_model, valid_records):
+        """Test the add_record shim appends to existing rows."""
+        for record in valid_records:
+            empty_model.add_record(record)
 
-    def test_add_multiple_records(self, valid_financial_record_data):
-        """Test adding multiple records at once."""
-        model = FinancialDataModel()
-        records = [
-            TransactionRecord(**valid_financial_record_data),
-            TransactionRecord(**{**valid_financial_record_data, "asset_name": "BTC"}),
-        ]
+        assert empty_model.df["asset_name"].tolist() == ["AAPL", "BTC"]
 
-        model.add_records(records)
+    def test_add_multiple_records(self, empty_model, valid_records):
+        """Test adding multiple records at once."""
+        empty_model.add_records(valid_records)
 
-        assert len(model.df) == 2
-        assert model.df.iloc[1]["asset_name"] == "BTC"
+        assert len(empty_model.df) == 2
+        assert empty_model.df.iloc[1]["asset_name"] == "BTC"
 
-    def test_load_from_dataframe_valid(self, sample_dataframe):
+    def test_load_from_dataframe_valid(self, empty_model, sample_dataframe):
         """Test loading valid data from DataFrame."""
-        model = FinancialDataModel()
-        errors = model.load_from_dataframe(sample_dataframe)
+        errors = empty_model.load_from_dataframe(sample_dataframe)
 
         assert len(errors) == 0
-        assert len(model.df) == 2
+        assert len(empty_model.df) == 2
 
-    def test_load_from_dataframe_with_invalid_rows(self):
+    def test_load_from_dataframe_with_invalid_rows(self, empty_model, invalid_rows_df):
         """Test loading DataFrame with some invalid rows."""
-        df = pd.DataFrame(
-            {
-                "asset_name": ["AAPL", "BTC"],
-                "date": ["2024-01-10", "2024-01-11"],
-                "asset_price": [150.50, -100.0],  # negative price
-                "volume": [10, 0.5],
-                "transaction_amount": [1505.00, -50.00],  # negative amount
-                "fee": [5.0, 10.0],
-                "currency": ["USD", "USD"],
-            }
+        errors = empty_model.load_from_dataframe(invalid_rows_df)
+
+        assert len(errors) > 0
+        assert len(empty_model.df) < 2  # Some records should be rejected
+
+    def test_load_from_dataframe_reports_non_validation_errors(
+        self, empty_model, sample_dataframe
+    ):
+        """Test a row whose validator raises TypeError is reported, not fatal."""
+        df = sample_dataframe.assign(date=["2024-01-10", object()])
+
+        errors = empty_model.load_from_dataframe(df)
+
+        assert len(errors) == 1
+        assert errors[0].startswith("Row 1:")
+        assert empty_model.df["asset_name"].tolist() == ["AAPL"]
+
+    def test_load_from_dataframe_keeps_rows_that_revalidate(
+        self, empty_model, sample_dataframe, monkeypatch
+    ):
+        """Test rows that pass on their own are loaded when the batch call fails."""
+        failing_adapter = SimpleNamespace(
+            validate_python=Mock(side_effect=RuntimeError("batch failed"))
         )
+        monkeypatch.setattr(data_model, "_RECORDS_ADAPTER", failing_adapter)
 
-        model = FinancialDataModel()
-        errors = model.load_from_dataframe(df)
+        errors = empty_model.load_from_dataframe(sample_dataframe)
 
-        assert len(errors) > 0
-        assert len(model.df) < 2  # Some records should be rejected
+        assert errors == []
+        assert len(empty_model.df) == len(sample_dataframe)
+
+    def test_load_from_dataframe_parses_date_column(
+        self, empty_model, sample_dataframe
+    ):
+        """Test string dates keep day-first precedence and bad dates are reported."""
+        df = sample_dataframe.assign(date=["01/02/2024", "not-a-date"])
+
+        errors = empty_model.load_from_dataframe(df)
+
+        assert len(errors) == 1
+        assert errors[0].startswith("Row 1:")
+        assert _BAD_DATE_RE.search(errors[0])
+        assert empty_model.df.iloc[0]["date"] == datetime(2024, 2, 1)
 
-    def test_to_dataframe(self, valid_financial_record_data):
+    def test_to_dataframe(self, empty_model, valid_record):
         """Test exporting to DataFrame."""
-        model = FinancialDataModel()
-        record = TransactionRecord(**valid_financial_record_data)
-        model.add_record(record)
+        empty_model.add_record(valid_record)
 
-        df = model.to_dataframe()
+        df = empty_model.to_dataframe()
 
         assert isinstance(df, pd.DataFrame)
         assert len(df) == 1
         assert "asset_name" in df.columns
 
-    def test_get_summary_empty(self):
+    def test_get_summary_empty(self, empty_model):
         """Test summary of empty model."""
-        model = FinancialDataModel()
-        summary = model.get_summary()
+        summary = empty_model.get_summary()
 
         assert summary["total_records"] == 0
         assert summary["unique_assets"] == 0
 
-    def test_get_summary_with_data(self, sample_dataframe):
+    def test_get_summary_with_data(self, loaded_model):
         """Test summary with data."""
-        model = FinancialDataModel()
-        model.load_from_dataframe(sample_dataframe)
-        summary = model.get_summary()
+        summary = loaded_model.get_summary()
 
         assert summary["total_records"] == 2
         assert summary["unique_assets"] == 2
         assert summary["total_transaction_amount"] == 24005.00
         assert summary["total_fees"] == 15.0
 
-    def test_to_csv(self, tmp_path, valid_financial_record_data):
-        """Test exporting to CSV."""
-        model = FinancialDataModel()
-        record = TransactionRecord(**valid_financial_record_data)
-        model.add_record(record)
+    def test_to_csv(self, empty_model, valid_record):
+        """Test exporting to CSV in memory."""
+        empty_model.add_records([valid_record])
 
-        filepath = tmp_path / "output.csv"
-        model.to_csv(str(filepath))
+        buffer = io.StringIO()
+        empty_model.to_csv(buffer)
 
-        assert filepath.exists()
-        loaded = pd.read_csv(filepath)
+        loaded = pd.read_csv(io.StringIO(buffer.getvalue()))
         assert len(loaded) == 1
+        assert loaded.iloc[0]["asset_name"] == "AAPL"
+
+    @pytest.mark.slow
+    def test_to_csv_file(self, empty_model, csv_dir, valid_record):
+        """Test exporting to a CSV file on disk."""
+        empty_model.add_records([valid_record])
+
+        filepath = csv_dir / f"output_{uuid.uuid4().hex}.csv"
+        empty_model.to_csv(str(filepath))
+
+        # Header plus one row; test_to_csv covers parsing the content back
+        with open(filepath) as f:
+            assert sum(1 for _ in f) == 2
@@ -633,6 +633,7 @@ class TestDatabaseConstraints:
         assert error["asset_type"] == "stock"
         assert error["resolved"] is False
 
+    @pytest.mark.real_mongo
     def test_database_indexes_exist(self, test_db):
         """Test that required database indexes exist."""
         # Check wallets collection indexes
@@ -13,8 +13,8 @@ from api.main import app
 from src.config.mongodb import MongoDBConfig
 from src.models.mongodb_models import Transaction, Wallet, Asset, User
 
-# Mark all tests in this module as integration tests
-pytestmark = pytest.mark.integration
+# Mark all tests in this module as integration tests that need a real MongoDB
+pytestmark = [pytest.mark.integration, pytest.mark.real_mongo]
 
 
 @pytest.fixture(scope="function")
@@ -209,6 +209,61 @@ class TestMongoDBConfig:
         assert (
             mock_db.transactions.create_index.call_count >= 3
         )  # user_id, wallet_id, date indexes
+        # Index creation must not migrate data; see migrate_wallet_user_ids.py
+        mock_db.wallets.find.assert_not_called()
+        mock_db.wallets.update_one.assert_not_called()
+
+    def test_normalize_wallet_user_ids(self, mongomock_client):
+        """Test legacy string user_ids are converted to ObjectId."""
+        db = mongomock_client["normalize_wallet_user_ids_test"]
+        db.wallets.create_index([("user_id", 1), ("name", 1)], unique=True)
+        user_id = ObjectId()
+        db.wallets.insert_many(
+            [
+                {"user_id": str(user_id), "name": "Legacy"},
+                {"user_id": user_id, "name": "Current"},
+                # Would collide with "Current" once converted, so it is renamed
+                {"user_id": str(user_id), "name": "Current"},
+                {"user_id": "not-an-object-id", "name": "Broken"},
+            ]
+        )
+        duplicate_id = db.wallets.find_one(
+            {"user_id": str(user_id), "name": "Current"}
+        )["_id"]
+
+        try:
+            converted = MongoDBConfig.normalize_wallet_user_ids(db)
+
+            assert converted == 2
+            assert db.wallets.find_one({"name": "Legacy"})["user_id"] == user_id
+            assert db.wallets.count_documents({"user_id": user_id}) == 3
+            renamed = db.wallets.find_one({"_id": duplicate_id})
+            assert renamed["user_id"] == user_id
+            assert renamed["name"] == f"Current ({duplicate_id})"
+            assert db.wallets.count_documents({"user_id": {"$type": "string"}}) == 1
+        finally:
+            mongomock_client.drop_database("normalize_wallet_user_ids_test")
+
+    def test_create_transaction_indexes(self, mongomock_client):
+        """Test the transactions indexes the API queries rely on are created."""
+        db = mongomock_client["create_transaction_indexes_test"]
+
+        try:
+            MongoDBConfig.create_transaction_indexes(db)
+
+            index_keys = {
+                tuple(index["key"])
+                for index in db.transactions.index_information().values()
+            }
+            assert {
+                (("wallet_id", 1),),
+                (("asset_id", 1),),
+                (("date", 1),),
+                (("transaction_type", 1),),
+                (("wallet_id", 1), ("date", -1)),
+            } <= index_keys
+        finally:
+            mongomock_client.drop_database("create_transaction_indexes_test")
 
     @patch("src.config.mongodb.MongoDBConfig.get_database")
     def test_initialize_collections_error(self, mock_get_database):
@@ -119,6 +119,28 @@ class TestTransactionMapper:
         wallet_id2 = mapper.get_or_create_wallet("Test Wallet", user_id)
         assert wallet_id == wallet_id2
 
+    @patch("src.services.transaction_mapper.AssetTypeMapper")
+    def test_get_or_create_wallet_in_db_stores_object_id_owner(
+        self, mock_asset_type_mapper_class
+    ):
+        """Test DB wallets are looked up and inserted with an ObjectId owner."""
+        mapper = TransactionMapper()
+        user_id = ObjectId()
+        mock_collection = Mock()
+        mock_collection.find_one.return_value = None
+        mock_collection.insert_one.return_value.inserted_id = ObjectId()
+
+        mapper.get_or_create_wallet(
+            "Test Wallet", user_id, wallets_collection=mock_collection
+        )
+
+        mock_collection.find_one.assert_called_once_with(
+            {"user_id": {"$in": [user_id, str(user_id)]}, "name": "Test Wallet"}
+        )
+        created_wallet = mock_collection.insert_one.call_args[0][0]
+        assert type(created_wallet["user_id"]) is ObjectId
+        assert created_wallet["user_id"] == user_id
+
     def test_get_or_create_asset_in_memory(self):
         """Test creating asset in memory."""
         mapper = TransactionMapper()